@@ -22,41 +22,97 @@ Version: 3.0 - Complete rewrite with bug fixes
 __version__ = "3.0.0"
 __author__ = "Bank Application Inventory System Team"
 
-# Make key components easily importable
-from .database import DatabaseConnection
-from .config import get_config, get_component_colors, COMPONENT_COLORS
-from .data_ops import DataManager, prepare_table_displays
-from .graph import GraphBuilder, get_graph_styles
-from .widgets import (
-    create_schema_selector, 
-    create_status_indicator, 
-    create_refresh_button,
-    create_export_button, 
-    create_layout_selector, 
-    create_sizing_selector,
-    create_search_box, 
-    create_filter_checkboxes, 
-    create_section_header,
-    create_output_area, 
-    create_tabbed_tables,
-    create_graph_container,
-    create_control_panel,
-    WidgetManager
-)
-from .export import (
-    export_to_csv,
-    export_graph_to_json,
-    trigger_graph_png_export,
-    create_export_controls,
-    export_summary_report
-)
-from .analytics import AnalyticsEngine, create_analytics_dashboard
-from .erd import ERDGenerator, create_erd_section
+import importlib
+from typing import TYPE_CHECKING
+
+# config is cheap (no pandas/ipywidgets), so keep it eager
+from .config import get_config, get_component_colors, reload_configs, COMPONENT_COLORS
+
+if TYPE_CHECKING:
+    from .database import DatabaseConnection
+    from .data_ops import DataManager, prepare_table_displays
+    from .graph import GraphBuilder, get_graph_styles
+    from .widgets import (
+        create_schema_selector,
+        create_status_indicator,
+        update_status_indicator,
+        create_refresh_button,
+        create_export_button,
+        create_layout_selector,
+        create_sizing_selector,
+        create_search_box,
+        create_filter_checkboxes,
+        create_section_header,
+        create_output_area,
+        create_tabbed_tables,
+        create_graph_container,
+        create_control_panel,
+        WidgetManager
+    )
+    from .export import (
+        export_to_csv,
+        export_graph_to_json,
+        export_graph_widget_to_json,
+        trigger_graph_png_export,
+        create_export_controls,
+        export_summary_report
+    )
+    from .analytics import AnalyticsEngine, create_analytics_dashboard
+    from .erd import ERDGenerator, create_erd_section
+
+# Heavy submodules are imported on first attribute access (PEP 562)
+_lazy_imports: dict[str, str] = {
+    'DatabaseConnection': '.database',
+    'DataManager': '.data_ops',
+    'prepare_table_displays': '.data_ops',
+    'GraphBuilder': '.graph',
+    'get_graph_styles': '.graph',
+    'create_schema_selector': '.widgets',
+    'create_status_indicator': '.widgets',
+    'update_status_indicator': '.widgets',
+    'create_refresh_button': '.widgets',
+    'create_export_button': '.widgets',
+    'create_layout_selector': '.widgets',
+    'create_sizing_selector': '.widgets',
+    'create_search_box': '.widgets',
+    'create_filter_checkboxes': '.widgets',
+    'create_section_header': '.widgets',
+    'create_output_area': '.widgets',
+    'create_tabbed_tables': '.widgets',
+    'create_graph_container': '.widgets',
+    'create_control_panel': '.widgets',
+    'WidgetManager': '.widgets',
+    'export_to_csv': '.export',
+    'export_graph_to_json': '.export',
+    'export_graph_widget_to_json': '.export',
+    'trigger_graph_png_export': '.export',
+    'create_export_controls': '.export',
+    'export_summary_report': '.export',
+    'AnalyticsEngine': '.analytics',
+    'create_analytics_dashboard': '.analytics',
+    'ERDGenerator': '.erd',
+    'create_erd_section': '.erd',
+}
+
+
+def __getattr__(name):
+    """Import the submodule providing ``name`` on first access and cache it."""
+    if name not in _lazy_imports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_lazy_imports[name], __package__)
+    obj = getattr(module, name)
+    globals()[name] = obj
+    return obj
+
+
+def __dir__():
+    return list(globals()) + list(_lazy_imports)
 
 __all__ = [
     'DatabaseConnection',
     'get_config', 
     'get_component_colors',
+    'reload_configs',
     'COMPONENT_COLORS',
     'DataManager',
     'prepare_table_displays',
@@ -64,6 +120,7 @@ __all__ = [
     'get_graph_styles',
     'create_schema_selector',
     'create_status_indicator',
+    'update_status_indicator',
     'create_refresh_button',
     'create_export_button',
     'create_layout_selector',
@@ -78,6 +135,7 @@ __all__ = [
     'WidgetManager',
     'export_to_csv',
     'export_graph_to_json',
+    'export_graph_widget_to_json',
     'trigger_graph_png_export',
     'create_export_controls',
     'export_summary_report',
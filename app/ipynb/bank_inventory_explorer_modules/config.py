@@ -4,14 +4,21 @@ Configuration and environment variable handling.
 
 import os
 import logging
+import functools
+from types import MappingProxyType
 import yaml
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 # Component color palette - mapped to our component_types
-COMPONENT_COLORS = {
+_COMPONENT_COLORS = {
     'Application':             '#2E7D32',  # Forest green - applications
     'Database':                '#1565C0',  # Deep blue - databases  
     'Cache':                   '#B71C1C',  # Deep red - caching layer
@@ -26,6 +33,9 @@ COMPONENT_COLORS = {
     'networking':              '#004D40'
 }
 
+# Read-only view shared by all callers; use dict(COMPONENT_COLORS) for a mutable copy
+COMPONENT_COLORS = MappingProxyType(_COMPONENT_COLORS)
+
 # Find project root
 def find_project_root():
     """Find the project root directory."""
@@ -36,40 +46,99 @@ def find_project_root():
         current = current.parent
     return Path.cwd()
 
-PROJECT_ROOT = find_project_root()
+# This file lives at <root>/app/ipynb/bank_inventory_explorer_modules/config.py,
+# so the root is a fixed number of levels up; only walk the tree if that's wrong.
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if not (PROJECT_ROOT / '.env').exists():
+    PROJECT_ROOT = find_project_root()
 
 # Load environment variables
 env_path = PROJECT_ROOT / '.env'
 if env_path.exists():
     load_dotenv(env_path)
-    logger.info(f"✓ Environment loaded from: {env_path}")
+    logger.info("✓ Environment loaded from: %s", env_path)
 else:
-    logger.warning(f"⚠️ No .env file found at: {env_path}")
+    logger.warning("⚠️ No .env file found at: %s", env_path)
+
+# Per-user root for on-disk caches (query results, rendered ERDs)
+USER_CACHE_DIR = os.path.join(
+    os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'bais'
+)
+
+
+def private_cache_dir(name):
+    """
+    Create a cache subdirectory readable by the current user only.
+    
+    Args:
+        name (str): Subdirectory of USER_CACHE_DIR
+        
+    Returns:
+        str: Directory path, mode 0700
+    """
+    path = os.path.join(USER_CACHE_DIR, name)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    # makedirs' mode is subject to umask and skipped for an existing dir
+    os.chmod(path, 0o700)
+    return path
 
 
+@functools.lru_cache(maxsize=32)
 def load_yaml_config(config_name):
     """
     Load a YAML configuration file from app/configs/.
     
+    Results are cached per config_name; call reload_configs() to pick up
+    edits made on disk.
+    
     Args:
         config_name (str): Name of config file (without .yaml extension)
         
     Returns:
-        dict: Configuration dictionary
+        Mapping: Read-only configuration mapping
     """
     config_path = PROJECT_ROOT / 'app' / 'configs' / f'{config_name}.yaml'
     
     try:
         with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
-            logger.debug(f"Loaded config: {config_name}")
-            return config or {}
+            config = yaml.load(file, Loader=_YamlLoader)
+            logger.debug("Loaded config: %s", config_name)
+            return MappingProxyType(config or {})
     except FileNotFoundError:
-        logger.warning(f"Config file not found: {config_path}")
-        return {}
+        logger.warning("Config file not found: %s", config_path)
+        return MappingProxyType({})
     except Exception as e:
-        logger.error(f"Error loading config {config_name}: {e}")
-        return {}
+        logger.error("Error loading config %s: %s", config_name, e)
+        return MappingProxyType({})
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_path(config_name, sub_path):
+    """
+    Walk a parsed config down a tuple of keys.
+    
+    Memoized on (config_name, sub_path), so repeated lookups of the same dotted
+    key cost a single cache hit.
+    
+    Returns:
+        Any: Leaf value or None if any key along the path is missing
+    """
+    result = load_yaml_config(config_name)
+    for part in sub_path:
+        try:
+            result = result[part]
+        except (KeyError, TypeError, IndexError):
+            logger.debug("Config key not found: %s.%s", config_name, '.'.join(sub_path))
+            return None
+    return result
+
+
+def reload_configs():
+    """Drop cached YAML configs so the next lookup re-reads them from disk."""
+    load_yaml_config.cache_clear()
+    _resolve_path.cache_clear()
+    logger.info("Configuration cache cleared")
 
 
 def get_config(key_path):
@@ -89,34 +158,50 @@ def get_config(key_path):
         if len(parts) == 2:
             value = os.getenv(parts[1])
             if value:
-                logger.debug(f"Retrieved env var: {parts[1]}")
+                logger.debug("Retrieved env var: %s", parts[1])
             return value
         return None
     
     # Handle YAML configs
-    config_file = parts[0]
-    config = load_yaml_config(config_file)
-    
-    # Navigate through nested dictionary
-    result = config
-    for part in parts[1:]:
-        if isinstance(result, dict) and part in result:
-            result = result[part]
-        else:
-            logger.debug(f"Config key not found: {key_path}")
-            return None
-    
-    return result
+    return _resolve_path(parts[0], tuple(parts[1:]))
 
 
 def get_component_colors():
     """
     Get the component color palette.
     
+    The returned mapping is read-only; callers that need to modify it should
+    take a copy with dict(get_component_colors()).
+    
     Returns:
-        dict: Component type to color mapping
+        Mapping: Component type to color mapping
     """
-    return COMPONENT_COLORS.copy()
+    return COMPONENT_COLORS
+
+
+def _snapshot_database_config():
+    """Read the database settings from the environment into a read-only mapping."""
+    return MappingProxyType({
+        'url': os.getenv('POSTGRESQL_BAIS_DB_ADMIN_URL'),
+        'supabase_url': os.getenv('SUPABASE_URL'),
+        'supabase_key': os.getenv('SUPABASE_ANON_KEY'),
+        'schema': 'demo'  # Default schema
+    })
+
+
+# .env is loaded once above, so the database settings are captured once too
+_DB_CONFIG = _snapshot_database_config()
+
+
+def refresh_env():
+    """
+    Reload .env (overriding current values) and rebuild the database config snapshot.
+    """
+    global _DB_CONFIG
+    if env_path.exists():
+        load_dotenv(env_path, override=True)
+    _DB_CONFIG = _snapshot_database_config()
+    logger.info("Environment reloaded")
 
 
 def get_database_config():
@@ -124,14 +209,9 @@ def get_database_config():
     Get database configuration.
     
     Returns:
-        dict: Database configuration
+        Mapping: Read-only database configuration
     """
-    return {
-        'url': os.getenv('POSTGRESQL_BAIS_DB_ADMIN_URL'),
-        'supabase_url': os.getenv('SUPABASE_URL'),
-        'supabase_key': os.getenv('SUPABASE_ANON_KEY'),
-        'schema': 'demo'  # Default schema
-    }
+    return _DB_CONFIG
 
 
 def get_app_config():
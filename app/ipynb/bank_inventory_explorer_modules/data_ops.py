@@ -2,17 +2,230 @@
 Data loading, caching, and transformation operations.
 """
 
+import os
+import glob
+import hashlib
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+from .config import COMPONENT_COLORS, USER_CACHE_DIR, private_cache_dir
+from .graph import DEFAULT_NODE_COLOR, DEPENDENCY_TYPES, PEER_TYPES, node_color_column, node_label_columns
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 logger = logging.getLogger(__name__)
 
+# Arrow-backed strings with NaN missing values, so boolean masks stay plain
+# numpy bools (the default `str` dtype from pandas 3 on)
+if HAS_PYARROW:
+    try:
+        ARROW_STRING_DTYPE = pd.StringDtype('pyarrow', na_value=float('nan'))
+    except TypeError:
+        ARROW_STRING_DTYPE = pd.StringDtype('pyarrow_numpy')
+else:
+    ARROW_STRING_DTYPE = None
+
+# Visual indicator per record_quality_grade value
+_QUALITY_INDICATORS = {
+    '_PT_GREEN_RECORD_': '🟢',
+    '_PT_YELLOW_RECORD_': '🟡',
+    '_PT_RED_RECORD_': '🔴'
+}
+_UNKNOWN_QUALITY_INDICATOR = '⚫'
+
+# Low-cardinality lookup columns of the components frame, stored as categoricals
+COMPONENT_CATEGORICAL_COLUMNS = (
+    'component_type', 'component_subtype', 'environment', 'physical_location',
+    'ops_status', 'abstraction_level', 'protocol_name', 'record_quality_grade'
+)
+
+# Low-cardinality label columns of the relationships frame
+RELATIONSHIP_CATEGORICAL_COLUMNS = (
+    'relationship_type', 'relationship_category', 'component1_type', 'component1_location',
+    'component2_type', 'component2_location'
+)
+
+
+def _sql_in_list(values):
+    """Render string constants as a SQL IN (...) list."""
+    return ', '.join(f"'{value}'" for value in sorted(values))
+
+
+# Graph edge bucket per relationship type, computed by the database
+_RELATIONSHIP_CATEGORY_SQL = f"""CASE
+                WHEN rt.type_name IN ({_sql_in_list(DEPENDENCY_TYPES)}) THEN 'dependency'
+                WHEN rt.type_name IN ({_sql_in_list(PEER_TYPES)}) THEN 'peer'
+                ELSE 'other'
+            END"""
+
+# Bump when the columns _fetch_components derives after the query change, so
+# persisted results written by older code are not served
+QUERY_CACHE_VERSION = 1
+
+# Rows per fetchmany batch when loading components/relationships
+LOAD_CHUNK_SIZE = 10_000
+
+# Column dtypes shared by the loaders: ids/FKs and counts are NOT NULL integers
+# that fit in 32 bits; low-cardinality labels are categoricals
+_ID_DTYPES = {
+    'component_id': 'int32',
+    'related_component_id': 'int32',
+    'relationship_id': 'int32',
+    'relationship_type_id': 'int32',
+    'component_type_id': 'int32',
+    'component_subtype_id': 'int32',
+    'physical_location_id': 'int32',
+    'protocol_id': 'int32',
+    'environment_id': 'int32',
+    'abstraction_level_id': 'int32',
+    'ops_status_id': 'int32',
+    'vlan': 'int16',
+    'port': 'int32',
+    'relationship_from_count': 'int32',
+    'relationship_to_count': 'int32',
+    'total_relationship_count': 'int32'
+}
+COMPONENT_DTYPES = {**_ID_DTYPES, **{col: 'category' for col in COMPONENT_CATEGORICAL_COLUMNS}}
+RELATIONSHIP_DTYPES = {**_ID_DTYPES, **{col: 'category' for col in RELATIONSHIP_CATEGORICAL_COLUMNS}}
+
+# Audit columns are only selected when the UI asks for them
+_AUDIT_COLUMNS = ('created_at', 'created_by', 'updated_at', 'updated_by')
+
+
+def _to_arrow_strings(df):
+    """
+    Store the free-text columns of a loaded frame as Arrow strings.
+    
+    Object columns holding strings (fqdn, description, ip, ...) become one
+    contiguous buffer instead of a Python object per cell. Categoricals and
+    columns already in an Arrow dtype are left alone.
+    """
+    if ARROW_STRING_DTYPE is None or df.empty:
+        return df
+    columns = [
+        col for col in df.columns
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) == 'string'
+    ]
+    if columns:
+        df = df.astype({col: ARROW_STRING_DTYPE for col in columns})
+        logger.debug("Arrow strings: %s", columns)
+    return df
+
+
+def _audit_select(alias):
+    """SELECT-list fragment for the audit columns of a table alias."""
+    return ''.join(f'{alias}.{col},\n            ' for col in _AUDIT_COLUMNS)
+
+
+_COMPONENTS_QUERY_TEMPLATE = """
+        WITH rel_counts AS (
+            -- One scan: each relationship row yields both of its endpoints
+            SELECT v.id,
+                   COUNT(*) FILTER (WHERE v.is_from) AS from_count,
+                   COUNT(*) FILTER (WHERE NOT v.is_from) AS to_count
+            FROM {{SCHEMA}}.biz_component_relationships r
+            CROSS JOIN LATERAL (
+                VALUES (r.component_id, true), (r.related_component_id, false)
+            ) AS v(id, is_from)
+            GROUP BY v.id
+        )
+        SELECT
+            c.component_id,
+            c.fqdn,
+            c.app_code,
+            c.physical_location_id,
+            c.vlan,
+            c.ip,
+            c.port,
+            c.mac,
+            c.protocol_id,
+            c.component_type_id,
+            c.component_subtype_id,
+            c.description,
+            c.environment_id,
+            c.abstraction_level_id,
+            c.ops_status_id,
+            c.record_quality_grade,
+            {{AUDIT_COLUMNS}}ct.type_name as component_type,
+            cs.subtype_name as component_subtype,
+            ce.environment_name as environment,
+            cpl.location_name as physical_location,
+            cos.status_name as ops_status,
+            cal.level_name as abstraction_level,
+            cp.protocol_name as protocol_name,
+            COALESCE(rel_counts.from_count, 0) as relationship_from_count,
+            COALESCE(rel_counts.to_count, 0) as relationship_to_count,
+            (
+                COALESCE(rel_counts.from_count, 0) +
+                COALESCE(rel_counts.to_count, 0)
+            ) as total_relationship_count
+        FROM {{SCHEMA}}.biz_components c
+        LEFT JOIN {{SCHEMA}}.component_types ct ON c.component_type_id = ct.component_type_id
+        LEFT JOIN {{SCHEMA}}.component_subtypes cs ON c.component_subtype_id = cs.component_subtype_id
+        LEFT JOIN {{SCHEMA}}.component_environments ce ON c.environment_id = ce.environment_id
+        LEFT JOIN {{SCHEMA}}.component_physical_locations cpl ON c.physical_location_id = cpl.physical_location_id
+        LEFT JOIN {{SCHEMA}}.component_ops_statuses cos ON c.ops_status_id = cos.ops_status_id
+        LEFT JOIN {{SCHEMA}}.component_abstraction_levels cal ON c.abstraction_level_id = cal.abstraction_level_id
+        LEFT JOIN {{SCHEMA}}.component_protocols cp ON c.protocol_id = cp.protocol_id
+        LEFT JOIN rel_counts ON c.component_id = rel_counts.id;
+        """
+
+_RELATIONSHIPS_QUERY_TEMPLATE = """
+        WITH comp AS (
+            SELECT c.component_id, c.fqdn, ct.type_name, cpl.location_name
+            FROM {{SCHEMA}}.biz_components c
+            LEFT JOIN {{SCHEMA}}.component_types ct ON c.component_type_id = ct.component_type_id
+            LEFT JOIN {{SCHEMA}}.component_physical_locations cpl ON c.physical_location_id = cpl.physical_location_id
+        )
+        SELECT 
+            r.relationship_id,
+            r.component_id,
+            r.related_component_id,
+            r.relationship_type_id,
+            r.description,
+            {{AUDIT_COLUMNS}}rt.type_name as relationship_type,
+            {{RELATIONSHIP_CATEGORY}} as relationship_category,
+            c1.fqdn as component1_name,
+            c1.type_name as component1_type,
+            c1.location_name as component1_location,
+            c2.fqdn as component2_name,
+            c2.type_name as component2_type,
+            c2.location_name as component2_location
+        FROM {{SCHEMA}}.biz_component_relationships r
+        JOIN {{SCHEMA}}.component_relationship_types rt ON r.relationship_type_id = rt.relationship_type_id
+        JOIN comp c1 ON r.component_id = c1.component_id
+        JOIN comp c2 ON r.related_component_id = c2.component_id;
+        """
+
+# Rendered queries keyed by show_audit
+_COMPONENTS_QUERIES = {
+    show_audit: _COMPONENTS_QUERY_TEMPLATE.replace('{{AUDIT_COLUMNS}}', _audit_select('c') if show_audit else '')
+    for show_audit in (False, True)
+}
+_RELATIONSHIPS_QUERIES = {
+    show_audit: _RELATIONSHIPS_QUERY_TEMPLATE
+    .replace('{{AUDIT_COLUMNS}}', _audit_select('r') if show_audit else '')
+    .replace('{{RELATIONSHIP_CATEGORY}}', _RELATIONSHIP_CATEGORY_SQL)
+    for show_audit in (False, True)
+}
+
 
 class DataManager:
     """
     Manages data loading, caching, and preparation for display.
     """
     
+    # Number of (schema, generation) query results kept per loader
+    LOAD_CACHE_SIZE = 8
+    # Components query results persisted across sessions, in this per-user (0700) cache subdir
+    QUERY_CACHE_SUBDIR = 'query_cache'
+    
     def __init__(self, database_connection):
         """
         Initialize data manager.
@@ -22,6 +235,14 @@ class DataManager:
         """
         self.db = database_connection
         self.cache = {}
+        # (schema, show_audit) -> (source frames, display tables)
+        self._display_cache = {}
+        # Query results per loader, (schema, data generation, show_audit) -> DataFrame,
+        # least recently used first
+        self._components_memo = OrderedDict()
+        self._relationships_memo = OrderedDict()
+        # Loaders run concurrently, each on its own pooled database connection
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='bais-load')
         logger.debug("DataManager initialized")
     
     def clear_cache(self, schema_only=False):
@@ -34,67 +255,150 @@ class DataManager:
         if schema_only:
             schema = self.db.current_schema
             self.cache[schema] = {}
+            for key in [key for key in self._display_cache if key[0] == schema]:
+                del self._display_cache[key]
             logger.info(f"Cleared cache for {schema} schema")
         else:
             self.cache = {}
+            self._display_cache = {}
+            self._components_memo.clear()
+            self._relationships_memo.clear()
             logger.info("Cleared all cached data")
     
-    def load_components(self):
+    def _generation_token(self):
+        """
+        Probe the current schema for a token that changes whenever its data does.
+        
+        Combines max(updated_at) and row counts (so deletes are noticed) of both
+        core tables. These are far cheaper than the full load queries.
+        
+        Returns:
+            tuple: Generation token, or None if the probe failed
+        """
+        query = """
+        SELECT
+            (SELECT max(updated_at) FROM {{SCHEMA}}.biz_components) AS components_updated,
+            (SELECT count(*) FROM {{SCHEMA}}.biz_components) AS components_count,
+            (SELECT max(updated_at) FROM {{SCHEMA}}.biz_component_relationships) AS relationships_updated,
+            (SELECT count(*) FROM {{SCHEMA}}.biz_component_relationships) AS relationships_count;
+        """
+        results = self.db.execute_query(query)
+        if not results:
+            return None
+        return tuple(results[0])
+    
+    def _load_cached(self, memo, fetch, schema, show_audit):
+        """
+        Return fetch(schema, generation, show_audit) as a shallow copy, querying only on a miss.
+        
+        Keeps the LOAD_CACHE_SIZE most recently used results in memo. Falls
+        back to an uncached query if the generation probe fails, and does not
+        keep empty results since those may stem from a failed query.
+        """
+        token = self._generation_token()
+        if token is None:
+            return fetch(schema, None, show_audit)
+        
+        key = (schema, token, show_audit)
+        df = memo.get(key)
+        if df is not None:
+            memo.move_to_end(key)
+        else:
+            df = fetch(schema, token, show_audit)
+            if df.empty:
+                return df
+            memo[key] = df
+            if len(memo) > self.LOAD_CACHE_SIZE:
+                memo.popitem(last=False)
+        # Shallow copy: callers may add/replace columns without touching the cache
+        return df.copy(deep=False)
+    
+    def load_components(self, show_audit=False):
         """
         Load components data with relationship counts.
+        
+        Repeat loads of an unchanged schema are served from memory, and after
+        a restart from the on-disk query cache instead of re-running the JOINs.
+
+        Args:
+            show_audit (bool): Whether to select the audit columns
 
         Returns:
             pd.DataFrame: Components with relationship counts
         """
-        query = """
-        SELECT
-            c.*,
-            ct.type_name as component_type,
-            cs.subtype_name as component_subtype,
-            ce.environment_name as environment,
-            cpl.location_name as physical_location,
-            cos.status_name as ops_status,
-            cal.level_name as abstraction_level,
-            cp.protocol_name as protocol_name,
-            c.app_code,
-            c.mac,
-            c.record_quality_grade,
-            c.created_at,
-            c.created_by,
-            c.updated_at,
-            c.updated_by,
-            COALESCE(rels_from.from_count, 0) as relationship_from_count,
-            COALESCE(rels_to.to_count, 0) as relationship_to_count,
-            (
-                COALESCE(rels_from.from_count, 0) +
-                COALESCE(rels_to.to_count, 0)
-            ) as total_relationship_count
-        FROM {{SCHEMA}}.biz_components c
-        LEFT JOIN {{SCHEMA}}.component_types ct ON c.component_type_id = ct.component_type_id
-        LEFT JOIN {{SCHEMA}}.component_subtypes cs ON c.component_subtype_id = cs.component_subtype_id
-        LEFT JOIN {{SCHEMA}}.component_environments ce ON c.environment_id = ce.environment_id
-        LEFT JOIN {{SCHEMA}}.component_physical_locations cpl ON c.physical_location_id = cpl.physical_location_id
-        LEFT JOIN {{SCHEMA}}.component_ops_statuses cos ON c.ops_status_id = cos.ops_status_id
-        LEFT JOIN {{SCHEMA}}.component_abstraction_levels cal ON c.abstraction_level_id = cal.abstraction_level_id
-        LEFT JOIN {{SCHEMA}}.component_protocols cp ON c.protocol_id = cp.protocol_id
-        LEFT JOIN (
-            SELECT component_id, COUNT(*) as from_count
-            FROM {{SCHEMA}}.biz_component_relationships
-            GROUP BY component_id
-        ) rels_from ON c.component_id = rels_from.component_id
-        LEFT JOIN (
-            SELECT related_component_id, COUNT(*) as to_count
-            FROM {{SCHEMA}}.biz_component_relationships
-            GROUP BY related_component_id
-        ) rels_to ON c.component_id = rels_to.related_component_id
-        ORDER BY c.fqdn;
+        return self._load_cached(self._components_memo, self._fetch_components, self.db.current_schema, show_audit)
+    
+    def _fetch_components(self, schema, generation, show_audit):
+        """
+        Run the components query against the current schema.
+        
+        Args:
+            schema (str): Schema being queried (cache key)
+            generation (tuple): Data generation token (cache key)
+            show_audit (bool): Whether to select the audit columns
+            
+        Returns:
+            pd.DataFrame: Components with relationship counts
         """
+        query = _COMPONENTS_QUERIES[show_audit]
+        
+        path = self._query_cache_path('components', schema, query, generation, show_audit)
+        if path and os.path.exists(path):
+            try:
+                df = pq.read_table(path).to_pandas()
+                logger.info(f"✓ Loaded {len(df)} components from query cache")
+                return df
+            except (pa.ArrowException, OSError) as e:
+                logger.debug(f"Ignoring unreadable query cache {path}: {e}")
         
         logger.info(f"Loading components from {self.db.current_schema} schema...")
-        df = self.db.get_dataframe(query)
+        # Few distinct labels across many rows: keep int codes plus one copy of each label
+        df = _to_arrow_strings(self.db.get_dataframe(query, chunksize=LOAD_CHUNK_SIZE, dtype=COMPONENT_DTYPES))
+        # Graph labels and colors derived once per load rather than per node on every graph build
+        if not df.empty:
+            df = df.assign(**node_label_columns(df), node_color=node_color_column(df))
         logger.info(f"✓ Loaded {len(df)} components")
+        
+        if path and not df.empty:
+            self._write_query_cache(path, df)
         return df
     
+    def _query_cache_path(self, name, schema, query, generation, show_audit):
+        """
+        Parquet path for a query result of one data generation.
+        
+        The file name carries a hash of the database identity (host, port,
+        database, user), and the digest also covers the query text,
+        QUERY_CACHE_VERSION and the node color palette, so results from another
+        database or from older code never match.
+        
+        Returns:
+            str or None: Path, or None if results of this generation can't be persisted
+        """
+        identity = getattr(self.db, 'identity', None)
+        if not HAS_PYARROW or generation is None or identity is None:
+            return None
+        database = hashlib.md5(repr(identity).encode()).hexdigest()[:12]
+        key = (generation, query, QUERY_CACHE_VERSION, DEFAULT_NODE_COLOR, sorted(COMPONENT_COLORS.items()))
+        digest = hashlib.md5(repr(key).encode()).hexdigest()
+        audit = 'audit' if show_audit else 'plain'
+        return os.path.join(USER_CACHE_DIR, self.QUERY_CACHE_SUBDIR, f"{name}_{schema}_{database}_{audit}_{digest}.parquet")
+    
+    @staticmethod
+    def _write_query_cache(path, df):
+        """Persist a query result, replacing files of older generations."""
+        prefix = path.rsplit('_', 1)[0]
+        try:
+            private_cache_dir(DataManager.QUERY_CACHE_SUBDIR)
+            for stale in glob.glob(f"{glob.escape(prefix)}_{'[0-9a-f]' * 32}.parquet"):
+                os.remove(stale)
+            # Write then rename so concurrent sessions never read a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            df.to_parquet(tmp_path, engine='pyarrow', compression='zstd')
+            os.replace(tmp_path, path)
+        except (pa.ArrowException, OSError, ValueError, TypeError) as e:
+            logger.debug(f"Query cache write failed: {e}")
+    
     # REMOVED: Dependencies tab - redundant with relationships for single-table schema
     # def load_dependencies(self):
     #     """
@@ -130,43 +434,47 @@ class DataManager:
     #     logger.info(f"✓ Loaded {len(df)} dependencies")
     #     return df
     
-    def load_relationships(self):
+    def load_relationships(self, show_audit=False):
         """
         Load all relationships (including failover, replication, etc).
         
+        Repeat loads of an unchanged schema are served from memory.
+        
+        Args:
+            show_audit (bool): Whether to select the audit columns
+            
         Returns:
             pd.DataFrame: All relationships with component names
         """
-        query = """
-        SELECT 
-            r.*,
-            rt.type_name as relationship_type,
-            c1.fqdn as component1_name,
-            ct1.type_name as component1_type,
-            cpl1.location_name as component1_location,
-            c2.fqdn as component2_name,
-            ct2.type_name as component2_type,
-            cpl2.location_name as component2_location
-        FROM {{SCHEMA}}.biz_component_relationships r
-        JOIN {{SCHEMA}}.component_relationship_types rt ON r.relationship_type_id = rt.relationship_type_id
-        JOIN {{SCHEMA}}.biz_components c1 ON r.component_id = c1.component_id
-        JOIN {{SCHEMA}}.biz_components c2 ON r.related_component_id = c2.component_id
-        LEFT JOIN {{SCHEMA}}.component_types ct1 ON c1.component_type_id = ct1.component_type_id
-        LEFT JOIN {{SCHEMA}}.component_types ct2 ON c2.component_type_id = ct2.component_type_id
-        LEFT JOIN {{SCHEMA}}.component_physical_locations cpl1 ON c1.physical_location_id = cpl1.physical_location_id
-        LEFT JOIN {{SCHEMA}}.component_physical_locations cpl2 ON c2.physical_location_id = cpl2.physical_location_id
-        ORDER BY c1.fqdn, c2.fqdn;
+        return self._load_cached(self._relationships_memo, self._fetch_relationships, self.db.current_schema, show_audit)
+    
+    def _fetch_relationships(self, schema, generation, show_audit):
+        """
+        Run the relationships query against the current schema.
+        
+        Args:
+            schema (str): Schema being queried (cache key)
+            generation (tuple): Data generation token (cache key)
+            show_audit (bool): Whether to select the audit columns
+            
+        Returns:
+            pd.DataFrame: All relationships with component names
         """
+        query = _RELATIONSHIPS_QUERIES[show_audit]
         
         logger.info(f"Loading relationships from {self.db.current_schema} schema...")
-        df = self.db.get_dataframe(query)
+        # relationship_type has ~14 values; codes also make GraphBuilder's isin() masks cheap
+        df = _to_arrow_strings(self.db.get_dataframe(query, chunksize=LOAD_CHUNK_SIZE, dtype=RELATIONSHIP_DTYPES))
         logger.info(f"✓ Loaded {len(df)} peer relationships")
         return df
     
-    def refresh_all_data(self):
+    def refresh_all_data(self, show_audit=False):
         """
         Refresh all data from database.
         
+        Args:
+            show_audit (bool): Whether to load the audit columns
+            
         Returns:
             dict: Dictionary with 'components', 'dependencies', 'relationships' DataFrames
         """
@@ -180,10 +488,14 @@ class DataManager:
         if schema not in self.cache:
             self.cache[schema] = {}
         
-        self.cache[schema]['components'] = self.load_components()
+        # The queries are independent: run them concurrently on separate connections
+        components_future = self._executor.submit(self.load_components, show_audit)
+        relationships_future = self._executor.submit(self.load_relationships, show_audit)
+        
+        self.cache[schema]['components'] = components_future.result()
         # REMOVED: Dependencies redundant with relationships for single-table schema
         # self.cache[schema]['dependencies'] = self.load_dependencies()
-        self.cache[schema]['relationships'] = self.load_relationships()
+        self.cache[schema]['relationships'] = relationships_future.result()
         
         # Log summary
         logger.info("Data refresh complete:")
@@ -192,6 +504,28 @@ class DataManager:
         
         return self.cache[schema]
     
+    def get_table_displays(self, data, show_audit=False):
+        """
+        Display tables for data, built once and reused while the same frames are shown.
+        
+        Args:
+            data (dict): Dictionary with DataFrames (as returned by refresh_all_data)
+            show_audit (bool): Whether to include audit columns
+            
+        Returns:
+            dict: Prepared DataFrames for display (shared; do not mutate)
+        """
+        key = (self.db.current_schema, show_audit)
+        frames = (data.get('components'), data.get('relationships'))
+        cached = self._display_cache.get(key)
+        if cached is not None and all(a is b for a, b in zip(cached[0], frames)):
+            logger.debug("Using cached table displays")
+            return dict(cached[1])
+        
+        display_tables = prepare_table_displays(data, show_audit=show_audit)
+        self._display_cache[key] = (frames, display_tables)
+        return dict(display_tables)
+    
     def get_cached_data(self):
         """
         Get cached data for current schema.
@@ -207,12 +541,62 @@ class DataManager:
 
 def format_quality_grade(grade):
     """Convert quality grade to visual indicator."""
-    indicators = {
-        '_PT_GREEN_RECORD_': '🟢',
-        '_PT_YELLOW_RECORD_': '🟡',
-        '_PT_RED_RECORD_': '🔴'
-    }
-    return indicators.get(grade, '⚫')
+    return _QUALITY_INDICATORS.get(grade, _UNKNOWN_QUALITY_INDICATOR)
+
+
+def format_quality_grades(grades):
+    """
+    Convert a Series of quality grades to visual indicators in one vectorized map.
+    
+    Args:
+        grades (pd.Series): record_quality_grade values
+        
+    Returns:
+        pd.Series: Indicator per row
+    """
+    indicators = grades.map(_QUALITY_INDICATORS)
+    # A categorical input can map to a categorical that rejects the fill value
+    if isinstance(indicators.dtype, pd.CategoricalDtype):
+        indicators = indicators.astype(object)
+    return indicators.fillna(_UNKNOWN_QUALITY_INDICATOR)
+
+
+# Display column mappings (source column -> header); 'quality_indicator' is derived
+_COMPONENT_COL_MAPPING = {
+    'quality_indicator': 'Quality',
+    'fqdn': 'FQDN',
+    'app_code': 'App Code',
+    'component_type': 'Type',
+    'component_subtype': 'Subtype',
+    'ip': 'IP Address',
+    'vlan': 'VLAN',
+    'port': 'Port',
+    'mac': 'MAC Address',
+    'protocol_name': 'Protocol',
+    'physical_location': 'Location',
+    'ops_status': 'Status',
+    'environment': 'Environment',
+    'abstraction_level': 'Abstraction',
+    'total_relationship_count': 'Connections'
+}
+
+_REL_COL_MAPPING = {
+    'component1_name': 'Component 1',
+    'component1_type': 'Component 1 Type',
+    'component1_location': 'Component 1 Location',
+    'relationship_type': 'Relationship',
+    'component2_name': 'Component 2',
+    'component2_type': 'Component 2 Type',
+    'component2_location': 'Component 2 Location',
+    'description': 'Description'
+}
+
+_AUDIT_COL_MAPPING = {
+    'created_at': 'Created At',
+    'created_by': 'Created By',
+    'updated_at': 'Updated At',
+    'updated_by': 'Updated By'
+}
 
 
 def prepare_table_displays(data, show_audit=False):
@@ -230,48 +614,28 @@ def prepare_table_displays(data, show_audit=False):
 
     # Components table
     if 'components' in data and not data['components'].empty:
-        components_df = data['components'].copy()
+        # Read columns straight from the source frame; no full copy needed
+        components_df = data['components']
+
+        # Column mapping, plus audit columns if requested
+        column_mapping = {**_COMPONENT_COL_MAPPING, **_AUDIT_COL_MAPPING} if show_audit else _COMPONENT_COL_MAPPING
+
+        # Project and rename the available columns in one pandas operation
+        cols_present = [c for c in column_mapping if c in components_df.columns]
+        components_display = components_df.reindex(columns=cols_present).rename(columns=column_mapping)
 
-        # Format quality grade
+        # Quality indicator is derived, and leads the column order
         if 'record_quality_grade' in components_df.columns:
-            components_df['quality_indicator'] = components_df['record_quality_grade'].apply(format_quality_grade)
-
-        # Define column mappings - corrected to match actual schema
-        column_mapping = {
-            'quality_indicator': 'Quality',
-            'fqdn': 'FQDN',
-            'app_code': 'App Code',
-            'component_type': 'Type',
-            'component_subtype': 'Subtype',
-            'ip': 'IP Address',
-            'vlan': 'VLAN',
-            'port': 'Port',
-            'mac': 'MAC Address',
-            'protocol_name': 'Protocol',
-            'physical_location': 'Location',
-            'ops_status': 'Status',
-            'environment': 'Environment',
-            'abstraction_level': 'Abstraction',
-            'total_relationship_count': 'Connections'
-        }
-
-        # Add audit columns if requested
-        if show_audit:
-            column_mapping.update({
-                'created_at': 'Created At',
-                'created_by': 'Created By',
-                'updated_at': 'Updated At',
-                'updated_by': 'Updated By'
-            })
-
-        # Build display dataframe with available columns
-        display_cols = {}
-        for db_col, display_name in column_mapping.items():
-            if db_col in components_df.columns:
-                display_cols[display_name] = components_df[db_col]
-
-        if display_cols:
-            components_display = pd.DataFrame(display_cols)
+            components_display.insert(
+                0, column_mapping['quality_indicator'],
+                format_quality_grades(components_df['record_quality_grade'])
+            )
+
+        # Queries return rows unordered; sort the narrow display frame instead
+        if 'FQDN' in components_display.columns:
+            components_display = components_display.sort_values('FQDN', kind='mergesort', ignore_index=True)
+
+        if not components_display.columns.empty:
             display_tables['components'] = components_display
             logger.debug(f"Prepared components display: {components_display.shape}")
     
@@ -302,37 +666,20 @@ def prepare_table_displays(data, show_audit=False):
     
     # Relationships table (all relationships)
     if 'relationships' in data and not data['relationships'].empty:
-        relationships_df = data['relationships'].copy()
-
-        # Define column mappings with proper names
-        rel_column_mapping = {
-            'component1_name': 'Component 1',
-            'component1_type': 'Component 1 Type',
-            'component1_location': 'Component 1 Location',
-            'relationship_type': 'Relationship',
-            'component2_name': 'Component 2',
-            'component2_type': 'Component 2 Type',
-            'component2_location': 'Component 2 Location',
-            'description': 'Description'
-        }
-
-        # Add audit columns if requested
-        if show_audit:
-            rel_column_mapping.update({
-                'created_at': 'Created At',
-                'created_by': 'Created By',
-                'updated_at': 'Updated At',
-                'updated_by': 'Updated By'
-            })
-
-        # Build display dataframe with available columns
-        display_cols = {}
-        for db_col, display_name in rel_column_mapping.items():
-            if db_col in relationships_df.columns:
-                display_cols[display_name] = relationships_df[db_col]
-
-        if display_cols:
-            relationships_display = pd.DataFrame(display_cols)
+        relationships_df = data['relationships']
+
+        # Column mapping, plus audit columns if requested
+        rel_column_mapping = {**_REL_COL_MAPPING, **_AUDIT_COL_MAPPING} if show_audit else _REL_COL_MAPPING
+
+        # Project and rename the available columns in one pandas operation
+        cols_present = [c for c in rel_column_mapping if c in relationships_df.columns]
+        relationships_display = relationships_df.reindex(columns=cols_present).rename(columns=rel_column_mapping)
+
+        sort_cols = [c for c in ('Component 1', 'Component 2') if c in relationships_display.columns]
+        if sort_cols:
+            relationships_display = relationships_display.sort_values(sort_cols, kind='mergesort', ignore_index=True)
+
+        if not relationships_display.columns.empty:
             display_tables['relationships'] = relationships_display
             logger.debug(f"Prepared relationships display: {relationships_display.shape}")
 
@@ -3,13 +3,119 @@ Database connection management with schema awareness.
 """
 
 import os
+import re
+import hashlib
+import functools
 import logging
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
+from psycopg2 import sql
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Connection pool bounds; connections stay open between queries
+POOL_MIN_CONNECTIONS = int(os.getenv('BAIS_PG_MIN', 2))
+POOL_MAX_CONNECTIONS = int(os.getenv('BAIS_PG_MAX', 10))
+
+# Server-side limits so a hung query or abandoned transaction can't block a notebook thread
+STATEMENT_TIMEOUT_MS = int(os.getenv('BAIS_STMT_TIMEOUT_MS', 30000))
+IDLE_IN_TRANSACTION_TIMEOUT_MS = 60000
+
+# TCP keepalives detect connections dropped by a NAT/firewall while idle in the pool
+KEEPALIVE_PARAMS = {
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+}
+
+# Repeated queries run as server-side prepared statements so PostgreSQL parses
+# and plans them once per connection. Set BAIS_PG_PREPARE=0 behind a
+# transaction-pooling pgbouncer, which does not keep them between transactions.
+PREPARE_STATEMENTS = os.getenv('BAIS_PG_PREPARE', '1') != '0'
+
+# Prepared statements kept per connection; the least recently used is deallocated
+STATEMENT_CACHE_SIZE = 256
+
+# Statements PREPARE accepts (a single SELECT/DML, optionally behind a WITH)
+_PREPARABLE_RE = re.compile(r'\s*(?:WITH|SELECT|INSERT|UPDATE|DELETE|VALUES)\b', re.IGNORECASE)
+
+# psycopg2 positional placeholders and escaped percent signs
+_PLACEHOLDER_RE = re.compile(r'%%|%s')
+
+
+def dsn_identity(dsn):
+    """
+    Which database a DSN/URL points at, without its credentials.
+    
+    Returns:
+        tuple: (host, port, dbname, user)
+    """
+    params = psycopg2.extensions.parse_dsn(dsn)
+    return tuple(params.get(key) for key in ('host', 'port', 'dbname', 'user'))
+
+
+@functools.lru_cache(maxsize=512)
+def _format_query(query, schema):
+    """
+    Query text with its {{SCHEMA}} placeholders bound to a schema.
+    
+    Memoized per (query, schema): the loaders reuse module-level query strings,
+    so each variant is built once and its text is identical on every call,
+    keeping the prepared-statement cache keys stable.
+    """
+    return query.replace('{{SCHEMA}}', schema)
+
+
+def _pushdown_query(query, params=None, where=None, columns=None, limit=None):
+    """
+    Wrap a query so projection, filtering and LIMIT run in the database.
+    
+    Filter values are bound as parameters (never inlined), so PostgreSQL can
+    still plan each call for its actual values.
+    
+    Args:
+        query (str): SQL query with {{SCHEMA}} placeholder
+        params (tuple): Parameters of query itself
+        where (dict): Column -> value equality filters, ANDed; None matches
+            NULL and a list/tuple/set matches any of its values
+        columns (list): Columns to select (default: all)
+        limit (int): Maximum number of rows
+        
+    Returns:
+        tuple: (sql.Composed query, params tuple)
+    """
+    select = sql.SQL(', ').join(map(sql.Identifier, columns)) if columns else sql.SQL('*')
+    composed = sql.SQL('SELECT {} FROM ({}) AS pushdown').format(
+        select, sql.SQL(query.strip().rstrip(';'))
+    )
+    params = list(params or ())
+    
+    if where:
+        predicates = []
+        for column, value in where.items():
+            if value is None:
+                predicates.append(sql.SQL('{} IS NULL').format(sql.Identifier(column)))
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                predicates.append(sql.SQL('{} = ANY(%s)').format(sql.Identifier(column)))
+                params.append(list(value))
+            else:
+                predicates.append(sql.SQL('{} = %s').format(sql.Identifier(column)))
+                params.append(value)
+        composed += sql.SQL(' WHERE ') + sql.SQL(' AND ').join(predicates)
+    
+    if limit is not None:
+        composed += sql.SQL(' LIMIT %s')
+        params.append(int(limit))
+    
+    return composed, tuple(params)
+
 
 class DatabaseConnection:
     """
@@ -19,8 +125,12 @@ class DatabaseConnection:
     
     def __init__(self):
         """Initialize database connection manager."""
-        self.connection = None
+        self._pool = None
         self.current_schema = 'demo'
+        # (host, port, dbname, user) of the connected database; None until connect()
+        self.identity = None
+        # connection -> OrderedDict(query text -> prepared statement name)
+        self._statement_caches = weakref.WeakKeyDictionary()
         logger.debug("DatabaseConnection initialized")
     
     def connect(self):
@@ -36,20 +146,45 @@ class DatabaseConnection:
                 logger.error("POSTGRESQL_BAIS_DB_ADMIN_URL not found in environment")
                 return False
             
-            logger.debug(f"Connecting to database (URL length: {len(db_url)} chars)")
+            logger.debug("Connecting to database (URL length: %s chars)", len(db_url))
             
-            self.connection = psycopg2.connect(
-                db_url,
-                cursor_factory=psycopg2.extras.RealDictCursor
+            # Threads borrow a connection per query, so concurrent loads don't share one
+            self._pool = psycopg2.pool.ThreadedConnectionPool(
+                POOL_MIN_CONNECTIONS,
+                POOL_MAX_CONNECTIONS,
+                dsn=db_url,
+                options=(
+                    f"-c statement_timeout={STATEMENT_TIMEOUT_MS} "
+                    f"-c idle_in_transaction_session_timeout={IDLE_IN_TRANSACTION_TIMEOUT_MS}"
+                ),
+                **KEEPALIVE_PARAMS
             )
             
+            self.identity = dsn_identity(db_url)
+            
             logger.info("✓ Database connection established successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Database connection failed: {e}")
+            logger.error("Database connection failed: %s", e)
             return False
     
+    @contextmanager
+    def _connection(self):
+        """
+        Borrow a pooled connection for the duration of a with block.
+        
+        The pool rolls back any open transaction when the connection is returned.
+        
+        Yields:
+            connection: psycopg2 connection
+        """
+        conn = self._pool.getconn()
+        try:
+            yield conn
+        finally:
+            self._pool.putconn(conn)
+    
     def set_schema(self, schema_name):
         """
         Set the current schema for queries.
@@ -58,11 +193,90 @@ class DatabaseConnection:
             schema_name (str): 'demo', 'live', or 'live_masked'
         """
         if schema_name not in ['demo', 'live', 'live_masked']:
-            logger.warning(f"Invalid schema name: {schema_name}, using 'demo'")
+            logger.warning("Invalid schema name: %s, using 'demo'", schema_name)
             schema_name = 'demo'
         
         self.current_schema = schema_name
-        logger.info(f"Schema set to: {schema_name}")
+        logger.info("Schema set to: %s", schema_name)
+    
+    def _query_text(self, conn, query):
+        """SQL text of a query (str or psycopg2.sql composable) bound to the current schema."""
+        if isinstance(query, sql.Composable):
+            query = query.as_string(conn)
+        return _format_query(query, self.current_schema)
+    
+    def _execute(self, cursor, formatted_query, params):
+        """
+        Execute a query on a cursor, via a prepared statement when possible.
+        
+        Args:
+            cursor: psycopg2 cursor
+            formatted_query (str): SQL with the schema already substituted
+            params (tuple): Query parameters
+        """
+        name = self._prepared_statement(cursor, formatted_query, params)
+        if name is None:
+            cursor.execute(formatted_query, params)
+        elif params:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+    
+    def _prepared_statement(self, cursor, formatted_query, params):
+        """
+        Name of the prepared statement for a query on the cursor's connection.
+        
+        Prepares the query on first use and deallocates the least recently used
+        statement once STATEMENT_CACHE_SIZE is exceeded.
+        
+        Returns:
+            str or None: Statement name, or None if the query should run directly
+                (disabled, not a single preparable statement, or named parameters)
+        """
+        if not PREPARE_STATEMENTS or not _PREPARABLE_RE.match(formatted_query):
+            return None
+        if params is not None and not isinstance(params, (tuple, list)):
+            return None
+        
+        statements = self._statement_caches.setdefault(cursor.connection, OrderedDict())
+        name = statements.get(formatted_query)
+        if name is not None:
+            statements.move_to_end(formatted_query)
+            return name or None
+        
+        sql = formatted_query.strip().rstrip(';')
+        if params:
+            # %s -> $1..$N and %% -> %, as psycopg2 would have done client-side
+            count = 0
+            
+            def placeholder(match):
+                nonlocal count
+                if match.group() == '%%':
+                    return '%'
+                count += 1
+                return f'${count}'
+            
+            sql = _PLACEHOLDER_RE.sub(placeholder, sql)
+            if count != len(params):
+                return None
+        
+        name = 'bais_' + hashlib.blake2b(formatted_query.encode(), digest_size=8).hexdigest()
+        try:
+            cursor.execute(f"PREPARE {name} AS {sql}")
+        except psycopg2.Error as e:
+            # e.g. a parameter type only its literal reveals: remember to run it directly
+            cursor.connection.rollback()
+            logger.debug("Not preparing query: %s", e)
+            name = ''
+        
+        statements[formatted_query] = name
+        if len(statements) > STATEMENT_CACHE_SIZE:
+            _, evicted = statements.popitem(last=False)
+            if evicted:
+                cursor.execute(f"DEALLOCATE {evicted}")
+        if name:
+            logger.debug("Prepared statement %s", name)
+        return name or None
     
     def execute_query(self, query, params=None):
         """
@@ -73,49 +287,169 @@ class DatabaseConnection:
             params (tuple): Query parameters
             
         Returns:
-            list: Query results as list of dictionaries
+            list: Query results as named tuples (fields by column name)
         """
-        if not self.connection:
+        fetched = self._fetch(query, params, psycopg2.extras.NamedTupleCursor)
+        return None if fetched is None else fetched[1]
+    
+    def execute_many(self, query, seq_of_params, page_size=500, template=None):
+        """
+        Execute a statement for many parameter sets in batched round-trips, then commit.
+        
+        A query containing "VALUES %s" goes through execute_values, which sends
+        page_size rows per multi-row INSERT; any other statement goes through
+        execute_batch, which sends page_size statements per round-trip.
+        
+        Args:
+            query (str): SQL statement with {{SCHEMA}} placeholder
+            seq_of_params (iterable): One parameter tuple per row/statement
+            page_size (int): Rows or statements per round-trip
+            template (str): Row template for execute_values, e.g. "(%s, %s, now())"
+        
+        Returns:
+            bool: True if every batch executed and was committed
+        """
+        if not self._pool:
+            logger.error("No database connection available")
+            return False
+        
+        try:
+            with self._connection() as conn:
+                with conn.cursor() as cursor:
+                    formatted_query = self._query_text(conn, query)
+                    if 'VALUES %s' in formatted_query:
+                        psycopg2.extras.execute_values(
+                            cursor, formatted_query, seq_of_params,
+                            template=template, page_size=page_size
+                        )
+                    else:
+                        psycopg2.extras.execute_batch(
+                            cursor, formatted_query, seq_of_params, page_size=page_size
+                        )
+                conn.commit()
+                return True
+        
+        except Exception as e:
+            logger.error("Batch execution failed: %s", e)
+            return False
+    
+    def _fetch(self, query, params=None, cursor_factory=None):
+        """
+        Execute a query and fetch all of its rows.
+        
+        Args:
+            query (str): SQL query with {{SCHEMA}} placeholder
+            params (tuple): Query parameters
+            cursor_factory: Row type; plain tuples by default
+            
+        Returns:
+            tuple: (column names, rows), or None if the query failed
+        """
+        if not self._pool:
             logger.error("No database connection available")
             return None
         
         try:
-            with self.connection.cursor() as cursor:
+            with self._connection() as conn, conn.cursor(cursor_factory=cursor_factory) as cursor:
                 # Replace schema placeholder
-                formatted_query = query.replace('{{SCHEMA}}', self.current_schema)
-                logger.debug(f"Executing query on schema: {self.current_schema}")
+                formatted_query = self._query_text(conn, query)
+                logger.debug("Executing query on schema: %s", self.current_schema)
                 
-                cursor.execute(formatted_query, params)
+                self._execute(cursor, formatted_query, params)
                 results = cursor.fetchall()
+                columns = [desc.name for desc in cursor.description]
                 
-                logger.debug(f"Query returned {len(results) if results else 0} rows")
-                return results
+                logger.debug("Query returned %s rows", len(results) if results else 0)
+                return columns, results
                 
         except Exception as e:
-            logger.error(f"Query execution failed: {e}")
+            logger.error("Query execution failed: %s", e)
             return None
     
-    def get_dataframe(self, query, params=None):
+    def get_dataframe(self, query, params=None, chunksize=None, dtype=None,
+                      where=None, columns=None, limit=None):
         """
         Execute query and return results as pandas DataFrame.
         
+        where/columns/limit are applied by wrapping the query in an outer
+        SELECT, so only the requested rows and columns cross the wire instead
+        of being sliced out in pandas afterwards. When they are used with
+        params, literal % signs in query must be written as %%.
+        
         Args:
             query (str): SQL query with {{SCHEMA}} placeholder
             params (tuple): Query parameters
+            chunksize (int): If set, stream and convert rows in batches of this size
+                instead of materializing the whole result first
+            dtype (dict): Column -> dtype casts applied to the assembled frame
+            where (dict): Column -> value equality filters (see _pushdown_query)
+            columns (list): Columns to return
+            limit (int): Maximum number of rows
             
         Returns:
             pd.DataFrame: Query results as DataFrame
         """
-        results = self.execute_query(query, params)
+        if where or columns or limit is not None:
+            query, params = _pushdown_query(query, params, where, columns, limit)
+        
+        if chunksize:
+            df = self._get_dataframe_chunked(query, params, chunksize)
+        else:
+            fetched = self._fetch(query, params)
+            # Tuple rows plus one column list; no per-row dicts for pandas to unpack
+            df = None if fetched is None else pd.DataFrame.from_records(fetched[1], columns=fetched[0])
         
-        if results is None:
+        if df is None:
             logger.warning("Query returned None, returning empty DataFrame")
             return pd.DataFrame()
         
-        df = pd.DataFrame(results)
-        logger.debug(f"Created DataFrame with shape: {df.shape}")
+        if dtype and not df.empty:
+            df = df.astype({col: typ for col, typ in dtype.items() if col in df.columns})
+        
+        logger.debug("Created DataFrame with shape: %s", df.shape)
         return df
     
+    def _get_dataframe_chunked(self, query, params, chunksize):
+        """
+        Stream a query through a server-side cursor and build its DataFrame
+        batch by batch with fetchmany.
+        
+        Only one batch of rows is held client-side at a time. DECLARE cannot
+        wrap EXECUTE, so these queries bypass the prepared-statement cache;
+        their planning cost is small next to the result transfer.
+        
+        Returns:
+            pd.DataFrame: Query results, or None if the query failed
+        """
+        if not self._pool:
+            logger.error("No database connection available")
+            return None
+        
+        try:
+            with self._connection() as conn, conn.cursor(name='bais_stream') as cursor:
+                formatted_query = self._query_text(conn, query)
+                logger.debug("Executing chunked query on schema: %s", self.current_schema)
+                
+                cursor.itersize = chunksize
+                cursor.execute(formatted_query, params)
+                
+                frames = []
+                batch = cursor.fetchmany(chunksize)
+                # A named cursor only has a description after its first fetch
+                columns = [desc.name for desc in cursor.description]
+                while batch:
+                    frames.append(pd.DataFrame.from_records(batch, columns=columns))
+                    batch = cursor.fetchmany(chunksize)
+                
+                logger.debug("Query returned %s batches", len(frames))
+                if not frames:
+                    return pd.DataFrame(columns=columns)
+                return pd.concat(frames, ignore_index=True)
+                
+        except Exception as e:
+            logger.error("Query execution failed: %s", e)
+            return None
+    
     def test_connection(self):
         """
         Test the database connection.
@@ -123,23 +457,25 @@ class DatabaseConnection:
         Returns:
             bool: True if connection is active
         """
-        if not self.connection:
+        if not self._pool:
             return False
         
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return True
+            with self._connection() as conn:
+                # A connection psycopg2 already knows is closed needs no round-trip
+                if conn.closed:
+                    return False
+                with conn.cursor() as cursor:
+                    # Prepared once per connection, so repeated pings skip parse/plan
+                    self._execute(cursor, "SELECT 1", None)
+                    cursor.fetchone()
+                    return True
         except:
             return False
     
     def close(self):
-        """Close the database connection."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-            logger.info("Database connection closed")
-    
-    def __del__(self):
-        """Cleanup on deletion."""
-        self.close()
\ No newline at end of file
+        """Close all pooled database connections (explicit shutdown)."""
+        if self._pool:
+            self._pool.closeall()
+            self._pool = None
+            logger.info("Database connections closed")
\ No newline at end of file
@@ -3,12 +3,15 @@ Entity Relationship Diagram generation (CRITICAL MISSING FEATURE!).
 """
 
 import os
+import mmap
+import hashlib
 import logging
-import tempfile
 import base64
 from pathlib import Path
 import ipywidgets as widgets
 from IPython.display import Image, display, HTML
+from .config import private_cache_dir
+from .database import dsn_identity
 
 try:
     from eralchemy2 import render_er
@@ -17,8 +20,47 @@ except ImportError:
     HAS_ERALCHEMY = False
     logging.warning("eralchemy2 not installed. ERD generation disabled.")
 
+try:
+    # eralchemy2's own building blocks, so Graphviz can run in-process via pygraphviz
+    from eralchemy2.main import all_to_intermediary, _intermediary_to_dot
+    from pygraphviz import AGraph
+    HAS_INPROCESS_RENDER = True
+except ImportError:
+    HAS_INPROCESS_RENDER = False
+
 logger = logging.getLogger(__name__)
 
+# Per-user (0700) cache subdirectory for rendered ERDs
+ERD_CACHE_SUBDIR = 'erd'
+
+# Everything the ERD draws: columns (type, nullability) plus PK/FK/unique
+# constraints and the columns FKs reference
+_SCHEMA_FINGERPRINT_QUERY = """
+        SELECT md5(concat_ws('|',
+            (SELECT string_agg(table_name || '.' || column_name || ':' || data_type || ':' || is_nullable, ','
+                               ORDER BY table_name, column_name)
+             FROM information_schema.columns
+             WHERE table_schema = %s),
+            (SELECT string_agg(tc.table_name || '.' || kcu.column_name || ':' || tc.constraint_type
+                               || ':' || tc.constraint_name || ':' || kcu.ordinal_position, ','
+                               ORDER BY tc.table_name, tc.constraint_name, kcu.ordinal_position)
+             FROM information_schema.table_constraints tc
+             JOIN information_schema.key_column_usage kcu
+               ON kcu.constraint_schema = tc.constraint_schema
+              AND kcu.constraint_name = tc.constraint_name
+              AND kcu.table_name = tc.table_name
+             WHERE tc.table_schema = %s),
+            (SELECT string_agg(ccu.constraint_name || '->' || ccu.table_schema || '.' || ccu.table_name
+                               || '.' || ccu.column_name, ','
+                               ORDER BY ccu.constraint_name, ccu.table_schema, ccu.table_name, ccu.column_name)
+             FROM information_schema.table_constraints tc
+             JOIN information_schema.constraint_column_usage ccu
+               ON ccu.constraint_schema = tc.constraint_schema
+              AND ccu.constraint_name = tc.constraint_name
+             WHERE tc.table_schema = %s AND tc.constraint_type = 'FOREIGN KEY')
+        )) AS fingerprint;
+        """
+
 
 class ERDGenerator:
     """
@@ -34,9 +76,55 @@ class ERDGenerator:
             database_connection: DatabaseConnection instance
         """
         self.db = database_connection
-        self.temp_dir = tempfile.gettempdir()
+        self._erd_cache = {}
         logger.debug(f"ERDGenerator initialized (eralchemy2: {HAS_ERALCHEMY})")
     
+    def _schema_fingerprint(self, schema):
+        """
+        Hash the columns and key constraints of a schema so unchanged DDL can reuse a rendered ERD.
+        
+        Args:
+            schema (str): Database schema
+            
+        Returns:
+            str: md5 hex digest, or None if it could not be computed
+        """
+        results = self.db.execute_query(_SCHEMA_FINGERPRINT_QUERY, (schema,) * 3)
+        if not results:
+            return None
+        return results[0].fingerprint
+    
+    def _render(self, schema_url, output_file, output_format):
+        """
+        Render a schema's ERD to output_file.
+        
+        The image is drawn to a temporary file and renamed into place, so a
+        concurrent session never serves a partly written file.
+        
+        Prefers laying out and drawing the DOT graph in-process with the Graphviz
+        C library (pygraphviz), avoiding a `dot` fork+exec per render; falls back
+        to eralchemy2's render_er if that path is unavailable or fails.
+        """
+        # Keep the extension last: render_er picks the format from it
+        tmp_file = f"{output_file[:-len(output_format) - 1]}.{os.getpid()}.tmp.{output_format}"
+        try:
+            if HAS_INPROCESS_RENDER:
+                try:
+                    tables, relationships = all_to_intermediary(schema_url)
+                    graph = AGraph(string=_intermediary_to_dot(tables, relationships))
+                    graph.layout(prog='dot')
+                    graph.draw(tmp_file, format=output_format)
+                    os.replace(tmp_file, output_file)
+                    return
+                except Exception as e:
+                    logger.debug(f"In-process ERD render failed ({e}), using render_er")
+            
+            render_er(schema_url, tmp_file)
+            os.replace(tmp_file, output_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    
     def generate_erd(self, schema='demo', output_format='png'):
         """
         Generate ERD for the specified schema.
@@ -65,19 +153,42 @@ class ERDGenerator:
             else:
                 schema_url = f"{db_url}?options=-csearch_path={schema}"
             
-            # Generate output filename
-            output_file = os.path.join(
-                self.temp_dir, 
-                f"erd_{schema}_{os.getpid()}.{output_format}"
-            )
+            # Reuse a previous render while the schema's DDL is unchanged. The
+            # fingerprint comes from the app connection but the ERD is drawn
+            # from db_url, so the key also names the database that is drawn.
+            cache_dir = private_cache_dir(ERD_CACHE_SUBDIR)
+            fingerprint = self._schema_fingerprint(schema)
+            if fingerprint:
+                database = hashlib.md5(repr(dsn_identity(db_url)).encode()).hexdigest()[:12]
+                cache_key = (schema, database, fingerprint, output_format)
+                cached = self._erd_cache.get(cache_key)
+                if cached and os.path.exists(cached):
+                    logger.info(f"✓ Using cached ERD: {cached}")
+                    return cached
+                
+                output_file = os.path.join(
+                    cache_dir,
+                    f"erd_{schema}_{database}_{fingerprint}.{output_format}"
+                )
+                if os.path.exists(output_file):
+                    self._erd_cache[cache_key] = output_file
+                    logger.info(f"✓ Using cached ERD: {output_file}")
+                    return output_file
+            else:
+                output_file = os.path.join(
+                    cache_dir,
+                    f"erd_{schema}_{os.getpid()}.{output_format}"
+                )
             
             logger.info(f"Generating ERD for {schema} schema...")
             
             # Generate ERD
-            render_er(schema_url, output_file)
+            self._render(schema_url, output_file, output_format)
             
             if os.path.exists(output_file):
                 logger.info(f"✓ ERD generated: {output_file}")
+                if fingerprint:
+                    self._erd_cache[cache_key] = output_file
                 return output_file
             else:
                 logger.error("ERD file not created")
@@ -125,23 +236,17 @@ class ERDGenerator:
             )
         
         try:
-            # Read the image file
-            with open(erd_path, 'rb') as f:
-                img_data = f.read()
-            
-            # Encode to base64
-            b64 = base64.b64encode(img_data).decode()
+            # Encode straight from the mapped file; no in-memory copy of the PNG
+            with open(erd_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                b64 = base64.b64encode(mm).decode('ascii')
             
             # Create download link
-            href = f'<a href="data:image/png;base64,{b64}" download="erd_{schema}.png">'
-            href += f'📊 Download ERD ({schema} schema)</a>'
-            
-            # Clean up temp file
-            try:
-                os.remove(erd_path)
-            except:
-                pass
+            href = ''.join((
+                '<a href="data:image/png;base64,', b64, f'" download="erd_{schema}.png">',
+                f'📊 Download ERD ({schema} schema)</a>'
+            ))
             
+            # The rendered file is kept: it doubles as the ERD cache
             return widgets.HTML(value=href)
             
         except Exception as e:
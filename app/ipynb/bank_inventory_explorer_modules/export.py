@@ -3,15 +3,132 @@ Export functionality for data, graphs, and visualizations.
 """
 
 import base64
+import gzip
 import json
 import logging
+import weakref
 import pandas as pd
-from io import StringIO, BytesIO
+from io import BytesIO
 import ipywidgets as widgets
 from IPython.display import Javascript, display
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# Frames with more rows than this are written with Arrow's C++ CSV writer
+ARROW_CSV_MIN_ROWS = 5000
+
+# Frames with more rows than this are downloaded as .csv.gz to keep the data URI small
+GZIP_CSV_MIN_ROWS = 10_000
+
+# Number of base64 CSV payloads kept for re-rendered export links
+CSV_B64_CACHE_SIZE = 16
+
+# (frame fingerprint) -> (weakref to frame, base64 CSV); entries drop when the frame is freed
+_csv_b64_cache = {}
+
+# Graph widget -> (node count, edge count, download link HTML); reset by a graph observer
+_graph_export_cache = weakref.WeakKeyDictionary()
+_observed_graph_widgets = weakref.WeakSet()
+
+# Columns counted by export_summary_report, with their report category
+SUMMARY_CATEGORIES = {
+    'component_type': 'Component Type',
+    'physical_location': 'Location'
+}
+
+
+def _arrow_csv_frame(dataframe):
+    """
+    Copy of a frame whose columns Arrow writes exactly as DataFrame.to_csv would.
+    
+    Integer and string columns already match. Everything else (floats, bools,
+    timestamps, mixed objects) is rendered to pandas' own string form first,
+    with missing values left missing so they stay empty fields.
+    """
+    rendered = {}
+    for col, series in dataframe.items():
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtype = dtype.categories.dtype
+        if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_string_dtype(dtype) and (
+                dtype != object or pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty')):
+            continue
+        rendered[col] = series.astype(str).where(series.notna())
+    return dataframe.assign(**rendered) if rendered else dataframe
+
+
+def _csv_bytes(dataframe):
+    """
+    Serialize a DataFrame to UTF-8 CSV bytes.
+    
+    Large frames go through pyarrow's columnar CSV writer when available;
+    small ones use DataFrame.to_csv. Both produce the same bytes: Arrow never
+    quotes, and frames with a value that would need quoting (or that Arrow
+    cannot convert) fall back to pandas' minimal quoting.
+    
+    Returns:
+        bytes-like: CSV payload
+    """
+    # Single-column frames are skipped: pandas quotes their empty fields
+    if HAS_PYARROW and len(dataframe) > ARROW_CSV_MIN_ROWS and dataframe.shape[1] > 1:
+        try:
+            table = pa.Table.from_pandas(_arrow_csv_frame(dataframe), preserve_index=False)
+            sink = pa.BufferOutputStream()
+            # Arrow always quotes header names, so the header row comes from pandas
+            sink.write(dataframe.head(0).to_csv(index=False).encode('utf-8'))
+            pacsv.write_csv(table, sink, pacsv.WriteOptions(include_header=False, quoting_style='none'))
+            return sink.getvalue().to_pybytes()
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            logger.debug("Arrow CSV writer unavailable for this frame (%s), using pandas", e)
+    
+    csv_buffer = BytesIO()
+    dataframe.to_csv(csv_buffer, index=False, encoding='utf-8')
+    return csv_buffer.getbuffer()
+
+
+def _csv_b64(dataframe):
+    """
+    Base64-encoded CSV for a DataFrame, memoized per frame object.
+    
+    Frames longer than GZIP_CSV_MIN_ROWS are gzip-compressed before encoding.
+    
+    The key is a cheap fingerprint (identity, shape, first/last index label);
+    frames are held by weak reference so the cache never keeps them alive.
+    In-place edits that keep the fingerprint are not detected.
+    
+    Returns:
+        str: ASCII base64 payload
+    """
+    key = (id(dataframe), dataframe.shape, dataframe.index[0], dataframe.index[-1])
+    cached = _csv_b64_cache.get(key)
+    if cached is not None and cached[0]() is dataframe:
+        logger.debug("Using cached CSV payload")
+        return cached[1]
+    
+    payload = _csv_bytes(dataframe)
+    if len(dataframe) > GZIP_CSV_MIN_ROWS:
+        payload = gzip.compress(payload, compresslevel=6)
+    b64 = base64.b64encode(payload).decode('ascii')
+    
+    if len(_csv_b64_cache) >= CSV_B64_CACHE_SIZE:
+        _csv_b64_cache.pop(next(iter(_csv_b64_cache)))
+    ref = weakref.ref(dataframe, lambda _ref, key=key: _csv_b64_cache.pop(key, None))
+    _csv_b64_cache[key] = (ref, b64)
+    return b64
+
 
 def export_to_csv(dataframe, filename='export.csv'):
     """
@@ -29,16 +146,17 @@ def export_to_csv(dataframe, filename='export.csv'):
         return widgets.HTML(value="<p>No data to export</p>")
     
     try:
-        # Convert DataFrame to CSV
-        csv_buffer = StringIO()
-        dataframe.to_csv(csv_buffer, index=False)
-        csv_string = csv_buffer.getvalue()
+        # Encode to base64 straight from the CSV bytes (reused for unchanged frames)
+        b64 = _csv_b64(dataframe)
         
-        # Encode to base64
-        b64 = base64.b64encode(csv_string.encode()).decode()
+        # Large exports are gzipped; text columns compress several-fold
+        mime = 'text/csv'
+        if len(dataframe) > GZIP_CSV_MIN_ROWS:
+            mime = 'application/gzip'
+            filename = f"{filename}.gz"
         
         # Create download link
-        href = f'<a href="data:text/csv;base64,{b64}" download="{filename}">📥 Download {filename}</a>'
+        href = f'<a href="data:{mime};base64,{b64}" download="{filename}">📥 Download {filename}</a>'
         
         logger.info(f"CSV export prepared: {filename} ({len(dataframe)} rows)")
         return widgets.HTML(value=href)
@@ -48,6 +166,21 @@ def export_to_csv(dataframe, filename='export.csv'):
         return widgets.HTML(value="<p style='color:red'>Export failed</p>")
 
 
+def graph_json_bytes(graph_data):
+    """
+    Serialize a {'nodes': [...], 'edges': [...]} payload in one call.
+    
+    orjson walks the nested dicts in C and accepts NumPy scalars/arrays;
+    without it, compact stdlib JSON is used.
+    
+    Returns:
+        bytes: UTF-8 JSON
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(graph_data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(graph_data, separators=(',', ':')).encode('utf-8')
+
+
 def export_graph_to_json(graph_data, filename='graph.json'):
     """
     Export graph data to JSON format.
@@ -60,11 +193,8 @@ def export_graph_to_json(graph_data, filename='graph.json'):
         widgets.HTML: Download link widget
     """
     try:
-        # Convert to JSON
-        json_string = json.dumps(graph_data, indent=2)
-        
-        # Encode to base64
-        b64 = base64.b64encode(json_string.encode()).decode()
+        # Encode compact JSON bytes to base64
+        b64 = base64.b64encode(graph_json_bytes(graph_data)).decode('ascii')
         
         # Create download link
         href = f'<a href="data:application/json;base64,{b64}" download="{filename}">💾 Download {filename}</a>'
@@ -77,6 +207,61 @@ def export_graph_to_json(graph_data, filename='graph.json'):
         return widgets.HTML(value="<p style='color:red'>Export failed</p>")
 
 
+def _element_json(element):
+    """Cytoscape JSON of a graph element: its data, plus its classes if any."""
+    if not hasattr(element, 'data'):
+        return str(element)
+    # Styling is class-based, so classes are needed to restyle an imported graph
+    classes = getattr(element, 'classes', '')
+    if classes:
+        return {'data': element.data, 'classes': classes}
+    return {'data': element.data}
+
+
+def _graph_state(cyto_widget):
+    """Serializable {'nodes', 'edges'} payload of a cytoscape widget's elements."""
+    graph = cyto_widget.graph
+    return {
+        'nodes': [_element_json(node) for node in graph.nodes],
+        'edges': [_element_json(edge) for edge in graph.edges]
+    }
+
+
+def export_graph_widget_to_json(cyto_widget, filename='graph.json'):
+    """
+    Export the current state of a graph widget to JSON, reusing the previous
+    export while the graph is unchanged.
+    
+    The first export registers an observer on the widget's graph that drops the
+    cached link whenever its nodes or edges are replaced; element counts are
+    checked as well to catch in-place list changes.
+    
+    Args:
+        cyto_widget: ipycytoscape.CytoscapeWidget instance
+        filename (str): Output filename
+        
+    Returns:
+        widgets.HTML: Download link widget
+    """
+    graph = cyto_widget.graph
+    counts = (len(graph.nodes), len(graph.edges))
+    cached = _graph_export_cache.get(cyto_widget)
+    if cached is not None and cached[:2] == counts and cached[2] == filename:
+        logger.debug("Using cached graph export")
+        return widgets.HTML(value=cached[3])
+    
+    if cyto_widget not in _observed_graph_widgets:
+        graph.observe(
+            lambda change: _graph_export_cache.pop(cyto_widget, None),
+            names=['nodes', 'edges']
+        )
+        _observed_graph_widgets.add(cyto_widget)
+    
+    link = export_graph_to_json(_graph_state(cyto_widget), filename)
+    _graph_export_cache[cyto_widget] = (*counts, filename, link.value)
+    return link
+
+
 def trigger_graph_png_export(cyto_widget, filename='graph.png'):
     """
     Trigger PNG export from ipycytoscape widget.
@@ -142,11 +327,7 @@ def create_export_controls(data, graph_widget=None):
         
         # JSON export for graph state
         if hasattr(graph_widget, 'graph'):
-            graph_data = {
-                'nodes': graph_widget.graph.nodes,
-                'edges': graph_widget.graph.edges
-            }
-            json_link = export_graph_to_json(graph_data, 'graph_state.json')
+            json_link = export_graph_widget_to_json(graph_widget, 'graph_state.json')
             exports.append(json_link)
     
     return widgets.VBox(
@@ -171,31 +352,24 @@ def export_summary_report(data, filename='summary_report.csv'):
         widgets.HTML: Download link widget
     """
     try:
-        summary_data = []
+        summary_df = pd.DataFrame()
         
         if 'components' in data:
             df = data['components']
             
-            # Component type counts
-            type_counts = df['component_type'].value_counts()
-            for comp_type, count in type_counts.items():
-                summary_data.append({
-                    'Category': 'Component Type',
-                    'Item': comp_type,
-                    'Count': count
-                })
-            
-            # Location counts
-            location_counts = df['physical_location'].value_counts()
-            for location, count in location_counts.items():
-                summary_data.append({
-                    'Category': 'Location',
-                    'Item': location,
-                    'Count': count
-                })
-        
-        # Create summary DataFrame
-        summary_df = pd.DataFrame(summary_data)
+            # One (Category, Item, Count) block per summarized column
+            summary_df = pd.concat(
+                [
+                    df[column].value_counts()
+                    .rename_axis('Item')
+                    .reset_index(name='Count')
+                    .assign(Category=category)
+                    for column, category in SUMMARY_CATEGORIES.items()
+                ],
+                ignore_index=True
+            )[['Category', 'Item', 'Count']]
+            # Categorical columns report unused categories with a zero count
+            summary_df = summary_df[summary_df['Count'] > 0]
         
         return export_to_csv(summary_df, filename)
         
@@ -3,19 +3,197 @@ Graph visualization and layout management.
 """
 
 import logging
+from collections import defaultdict
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
 from .config import COMPONENT_COLORS
 
 logger = logging.getLogger(__name__)
 
+# Node color for component types missing from the palette
+DEFAULT_NODE_COLOR = '#757575'
+
+# Dependency-type relationships from schema
+DEPENDENCY_TYPES = frozenset((
+    'replicates_from', 'fails_over_to', 'consumes_api_from',
+    'persists_to', 'publishes_to', 'subscribes_to', 'proxied_by',
+    'authenticates_via', 'monitors'
+))
+
+# Peer/collaboration relationships
+PEER_TYPES = frozenset((
+    'collaborates_with', 'peers_with', 'vm_guest_of',
+    'load_balanced_by', 'communicates_with'
+))
+
+# A relationship type must map to exactly one edge bucket
+assert DEPENDENCY_TYPES.isdisjoint(PEER_TYPES), DEPENDENCY_TYPES & PEER_TYPES
+
+# Component columns searched by the graph filters (node name, ip, vlan, location)
+SEARCH_COLUMNS = ('fqdn', 'ip', 'vlan', 'physical_location')
+
+# Node style shared through the stylesheet; size comes from each node's data
+NODE_STYLE = {
+    'border-width': 2,
+    'border-color': '#000000',
+    'border-style': 'solid',
+    'color': '#ffffff',
+    'text-outline-width': 2,
+    'text-outline-color': '#000000',
+    'width': 'data(size)',
+    'height': 'data(size)',
+    'font-size': '10px'
+}
+
+# Search highlighting, applied by adding these classes to nodes
+SEARCH_MATCH_CLASS = 'search-match'
+SEARCH_FADED_CLASS = 'search-faded'
+
+# Edge styles per edge class (an edge's class is its type)
+HIERARCHICAL_EDGE_STYLE = {
+    'line-color': '#424242',
+    'line-style': 'solid',
+    'target-arrow-color': '#424242',
+    'target-arrow-shape': 'triangle',
+    'width': 2,
+    'curve-style': 'straight'
+}
+
+DEPENDENCY_EDGE_STYLE = {
+    'line-color': '#616161',
+    'line-style': 'dashed',
+    'target-arrow-color': '#616161',
+    'target-arrow-shape': 'triangle',
+    'width': 2,
+    'curve-style': 'straight'
+}
+
+PEER_EDGE_STYLE = {
+    'line-color': '#757575',
+    'line-style': 'dotted',
+    'width': 2,
+    'curve-style': 'straight'
+}
+
+
+# Cytoscape layout options per layout algorithm
+_LAYOUT_CONFIGS = MappingProxyType({
+    'dagre': {
+        'name': 'dagre',
+        'rankDir': 'TB',
+        'spacingFactor': 1.5
+    },
+    'cose': {
+        'name': 'cose',
+        'idealEdgeLength': 100,
+        'nodeOverlap': 20
+    },
+    'circle': {
+        'name': 'circle'
+    },
+    'grid': {
+        'name': 'grid'
+    }
+})
+
+# Cytoscape stylesheet returned by get_graph_styles; nodes and edges carry
+# only data and classes, every style lives here
+_GRAPH_STYLES = [
+    {
+        'selector': 'node',
+        'style': {
+            'content': 'data(label)',
+            'text-valign': 'center',
+            'text-halign': 'center',
+            'font-family': 'Arial, sans-serif',
+            'font-weight': 'bold',
+            'background-color': 'data(bgColor)',  # Data-driven color
+            **NODE_STYLE
+        }
+    },
+    {
+        'selector': f'node.{SEARCH_MATCH_CLASS}',
+        'style': {'border-color': '#FFD700', 'border-width': 4}
+    },
+    {
+        'selector': f'node.{SEARCH_FADED_CLASS}',
+        'style': {'opacity': 0.3}
+    },
+    {
+        'selector': 'edge',
+        'style': {
+            'content': 'data(label)',
+            'font-size': '8px',
+            'text-rotation': 'autorotate',
+            'text-margin-y': -10
+        }
+    },
+    {'selector': 'edge.hierarchical', 'style': HIERARCHICAL_EDGE_STYLE},
+    {'selector': 'edge.dependency', 'style': DEPENDENCY_EDGE_STYLE},
+    {'selector': 'edge.peer', 'style': PEER_EDGE_STYLE}
+]
+
+
+def node_label_columns(components_df):
+    """
+    Derived node label columns for a components frame.
+    
+    Args:
+        components_df (pd.DataFrame): Components data with fqdn and physical_location
+        
+    Returns:
+        dict: 'short_name' (FQDN up to the first dot) and 'node_label'
+        ('<short_name>.<location>') Series
+    """
+    short_names = components_df['fqdn'].str.split('.', n=1).str[0]
+    locations = components_df['physical_location'].astype(str)
+    node_labels = short_names.fillna('') + '.' + locations.fillna('')
+    return {'short_name': short_names, 'node_label': node_labels}
+
+
+def node_color_column(components_df, component_colors=COMPONENT_COLORS):
+    """
+    Node color per component from its type, DEFAULT_NODE_COLOR where unmapped.
+    
+    Types missing from the palette are logged once per call, not per component.
+    
+    Args:
+        components_df (pd.DataFrame): Components data with component_type
+        component_colors (dict): Type name -> color
+        
+    Returns:
+        pd.Series: Color strings, aligned with components_df
+    """
+    # Map over the (few) distinct types, not every row
+    types = components_df['component_type'].astype(object)
+    colors = types.map(component_colors.get).fillna(DEFAULT_NODE_COLOR)
+    missing = types[colors.eq(DEFAULT_NODE_COLOR) & types.notna()].unique()
+    if len(missing):
+        logger.info(f"Component types not in color palette (default gray): {sorted(map(str, missing))}")
+    return colors
+
 
 class GraphBuilder:
     """
     Builds and manages graph visualizations with proper colors and filtering.
     """
     
+    # Relationship type buckets (module-level sets, kept here for existing callers)
+    DEPENDENCY_TYPES = DEPENDENCY_TYPES
+    PEER_TYPES = PEER_TYPES
+    
     def __init__(self):
         """Initialize graph builder."""
         self.component_colors = COMPONENT_COLORS
+        # Lowercased search fields and integer ids of the last built node list, parallel to it
+        self._search_nodes = None
+        self._search_blobs = None
+        self._node_ids = None
+        # Integer endpoint ids of the last built edge list, parallel to it
+        self._id_edges = None
+        self._edge_sources = None
+        self._edge_targets = None
         logger.debug("GraphBuilder initialized")
     
     def create_graph_data(self, data, sizing_mode='combined', 
@@ -41,115 +219,133 @@ class GraphBuilder:
         relationships_df = data.get('relationships', None)
         
         # Create nodes with PROPER COLORS (BUG FIX!)
-        nodes = []
-        for _, comp in components_df.iterrows():
-            # Debug logging for gray node issue
-            comp_id = comp.get('component_id', 'UNKNOWN')
-            comp_name = comp.get('fqdn', '')
-            comp_type = comp.get('component_type', '')
-            comp_location = comp.get('physical_location', '')
-            
-            if not comp_name or not comp_type:
-                logger.warning(f"Missing data for component {comp_id}: fqdn='{comp_name}', type='{comp_type}', location='{comp_location}'")
-            
-            # Create label - extract short name from FQDN
-            fqdn_parts = comp_name.split('.')
-            short_name = fqdn_parts[0] if fqdn_parts else comp_name
-            label = f"{short_name}.{comp_location}"
-            
-            # GET CORRECT COLOR FROM PALETTE (CRITICAL BUG FIX!)
-            component_type = comp['component_type']
-            color = self.component_colors.get(component_type, '#757575')
-            
-            # Log if using default gray color
-            if color == '#757575':
-                logger.info(f"Component {comp_id} using default gray - type '{component_type}' not in color palette")
-            
-            # Calculate node size
-            node_size = self._calculate_node_size(comp, sizing_mode)
-            
-            node = {
-                'data': {
-                    'id': str(comp['component_id']),
-                    'label': label,
-                    'name': comp.get('fqdn', ''),
-                    'app_code': comp.get('app_code', ''),
-                    'type': component_type,
-                    'subtype': comp.get('component_subtype', ''),
-                    'ip': comp.get('ip', ''),
-                    'mac': comp.get('mac', ''),
-                    'location': comp['physical_location'],
-                    'vlan': comp.get('vlan', ''),
-                    'port': comp.get('port', ''),
-                    'protocol': comp.get('protocol_name', ''),
-                    'quality': comp.get('record_quality_grade', ''),
-                    'connections': comp.get('total_relationship_count', 0),
-                    'size': node_size,
-                    'bgColor': color,  # Move color to data for data-driven styling
-                    # FK IDs for tooltips
-                    'component_id': comp.get('component_id'),
-                    'type_id': comp.get('component_type_id'),
-                    'subtype_id': comp.get('component_subtype_id'),
-                    'location_id': comp.get('physical_location_id'),
-                    'protocol_id': comp.get('protocol_id'),
-                    'environment_id': comp.get('environment_id')
-                },
-                'style': {
-                    'border-width': 2,
-                    'border-color': '#000000',
-                    'border-style': 'solid',
-                    'color': '#ffffff',
-                    'text-outline-width': 2,
-                    'text-outline-color': '#000000',
-                    'width': f'{node_size}px',
-                    'height': f'{node_size}px',
-                    'font-size': '10px'
-                }
-            }
-            nodes.append(node)
+        # Node fields are built as parallel columns; dicts are only zipped at the end
+        columns = self._node_columns(components_df, sizing_mode)
+        
+        # Debug logging for gray node issue (only rows that need it are visited)
+        missing = (
+            components_df['fqdn'].astype(object).fillna('').eq('') |
+            components_df['component_type'].astype(object).fillna('').eq('')
+        )
+        for i in np.flatnonzero(missing.to_numpy()):
+            logger.warning(f"Missing data for component {columns['component_id'][i]}: fqdn='{columns['name'][i]}', "
+                           f"type='{columns['type'][i]}', location='{columns['location'][i]}'")
+        
+        keys = tuple(columns)
+        nodes = [{'data': dict(zip(keys, values))} for values in zip(*columns.values())]
         
         logger.info(f"Created {len(nodes)} nodes with sizing mode: {sizing_mode}")
         
+        self._search_nodes = nodes
+        self._search_blobs = np.array(columns['_search_blob'], dtype=str)
+        self._node_ids = components_df['component_id'].to_numpy()
+        
         # Create edges
         edges = []
+        edge_sources = []
+        edge_targets = []
 
         # All relationships (including all 14 types from schema)
-        if relationships_df is not None:
-            # Define all dependency-type relationships from schema
-            dependency_types = (
-                'replicates_from', 'fails_over_to', 'consumes_api_from',
-                'persists_to', 'publishes_to', 'subscribes_to', 'proxied_by',
-                'authenticates_via', 'monitors'
-            )
-
-            # Peer/collaboration relationships
-            peer_types = (
-                'collaborates_with', 'peers_with', 'vm_guest_of',
-                'load_balanced_by', 'communicates_with'
-            )
+        if relationships_df is not None and not relationships_df.empty:
+            rel_types = relationships_df['relationship_type']
+            # Bucketed by the relationships query when available; classify here otherwise
+            categories = relationships_df.get('relationship_category')
+            source_ids = relationships_df['component_id'].to_numpy()
+            target_ids = relationships_df['related_component_id'].to_numpy()
+            # Endpoint ids stringified column-wise, once
+            sources = relationships_df['component_id'].astype(str)
+            targets = relationships_df['related_component_id'].astype(str)
 
             dep_count = 0
             peer_count = 0
 
-            for _, rel in relationships_df.iterrows():
-                rel_type = rel.get('relationship_type', '')
+            # Dependency-type relationships
+            if show_dependencies:
+                if categories is not None:
+                    dep_mask = categories == 'dependency'
+                else:
+                    dep_mask = rel_types.isin(DEPENDENCY_TYPES)
+                edges.extend(self._build_edges(
+                    'dep', 'dependency',
+                    sources[dep_mask], targets[dep_mask], rel_types[dep_mask]
+                ))
+                edge_sources.append(source_ids[dep_mask.to_numpy()])
+                edge_targets.append(target_ids[dep_mask.to_numpy()])
+                dep_count = int(dep_mask.sum())
 
-                # Check if it's a dependency-type relationship
-                if show_dependencies and rel_type in dependency_types:
-                    edge = self._create_dependency_edge(rel)
-                    edges.append(edge)
-                    dep_count += 1
-                # Otherwise check if it's a peer relationship
-                elif show_peer and rel_type in peer_types:
-                    edge = self._create_peer_edge(rel)
-                    edges.append(edge)
-                    peer_count += 1
+            # Peer relationships
+            if show_peer:
+                if categories is not None:
+                    peer_mask = categories == 'peer'
+                else:
+                    peer_mask = rel_types.isin(PEER_TYPES)
+                edges.extend(self._build_edges(
+                    'peer', 'peer',
+                    sources[peer_mask], targets[peer_mask], rel_types[peer_mask]
+                ))
+                edge_sources.append(source_ids[peer_mask.to_numpy()])
+                edge_targets.append(target_ids[peer_mask.to_numpy()])
+                peer_count = int(peer_mask.sum())
 
             logger.debug(f"Created {dep_count} dependency edges, {peer_count} peer edges")
         
+        self._id_edges = edges
+        self._edge_sources = np.concatenate(edge_sources) if edge_sources else np.array([], dtype=np.int64)
+        self._edge_targets = np.concatenate(edge_targets) if edge_targets else np.array([], dtype=np.int64)
+        
         logger.info(f"Created graph with {len(nodes)} nodes and {len(edges)} edges")
         return nodes, edges
     
+    @staticmethod
+    def _search_blob_column(components_df):
+        """Lowercased SEARCH_COLUMNS values per component, joined with NUL separators."""
+        parts = [components_df[col].astype(str) for col in SEARCH_COLUMNS if col in components_df.columns]
+        if not parts:
+            return pd.Series('', index=components_df.index)
+        
+        blobs = parts[0]
+        for part in parts[1:]:
+            blobs = blobs + '\0' + part
+        return blobs.str.lower()
+    
+    @staticmethod
+    def _build_adjacency(edges):
+        """Map each node id to the set of ids it shares an edge with (either direction)."""
+        adjacency = defaultdict(set)
+        for edge in edges:
+            source = edge['data']['source']
+            target = edge['data']['target']
+            adjacency[source].add(target)
+            adjacency[target].add(source)
+        return adjacency
+    
+    def _search_matches(self, nodes, search_lower):
+        """
+        Boolean match per node for a lowercased search term.
+        
+        Searches all blobs in one vectorized pass when nodes is the list from the
+        last create_graph_data call; otherwise tests each node's cached blob.
+        
+        Returns:
+            np.ndarray or list: Match flags parallel to nodes
+        """
+        if nodes is self._search_nodes and self._search_blobs is not None:
+            return np.char.find(self._search_blobs, search_lower) >= 0
+        
+        return [self._node_matches(node['data'], search_lower) for node in nodes]
+    
+    @staticmethod
+    def _node_matches(node_data, search_lower):
+        """Test one node's data against a lowercased search term."""
+        if '_search_blob' in node_data:
+            return search_lower in node_data['_search_blob']
+        return (
+            search_lower in node_data.get('name', '').lower() or
+            search_lower in node_data.get('ip', '').lower() or
+            search_lower in str(node_data.get('vlan', '')).lower() or
+            search_lower in node_data.get('location', '').lower()
+        )
+    
     def apply_search_filter(self, nodes, search_term):
         """
         Apply search filter to highlight matching nodes.
@@ -166,24 +362,9 @@ class GraphBuilder:
         
         search_lower = search_term.lower()
         
-        for node in nodes:
-            node_data = node['data']
-            
-            # Check if node matches search
-            matches = (
-                search_lower in node_data.get('name', '').lower() or
-                search_lower in node_data.get('ip', '').lower() or
-                search_lower in str(node_data.get('vlan', '')).lower() or
-                search_lower in node_data.get('location', '').lower()
-            )
-            
-            if matches:
-                # Highlight matching nodes
-                node['style']['border-color'] = '#FFD700'
-                node['style']['border-width'] = 4
-            else:
-                # Fade non-matching nodes
-                node['style']['opacity'] = 0.3
+        for node, matches in zip(nodes, self._search_matches(nodes, search_lower)):
+            # Highlight matching nodes, fade the rest
+            self._add_class(node, SEARCH_MATCH_CLASS if matches else SEARCH_FADED_CLASS)
         
         return nodes
     
@@ -203,31 +384,21 @@ class GraphBuilder:
             return nodes, edges
         
         search_lower = search_term.lower()
+        matches = self._search_matches(nodes, search_lower)
+        
+        if nodes is self._search_nodes and edges is self._id_edges:
+            return self._neighborhood_by_id(nodes, edges, matches)
         
         # Find matching node IDs
-        matched_ids = set()
-        for node in nodes:
-            node_data = node['data']
-            if (search_lower in node_data.get('name', '').lower() or
-                search_lower in node_data.get('ip', '').lower() or
-                search_lower in str(node_data.get('vlan', '')).lower() or
-                search_lower in node_data.get('location', '').lower()):
-                matched_ids.add(node_data['id'])
+        matched_ids = {node['data']['id'] for node, match in zip(nodes, matches) if match}
         
         if not matched_ids:
             # No matches, return original
             return nodes, edges
         
         # Find all connected node IDs
-        connected_ids = matched_ids.copy()
-        for edge in edges:
-            source = edge['data']['source']
-            target = edge['data']['target']
-            
-            if source in matched_ids:
-                connected_ids.add(target)
-            if target in matched_ids:
-                connected_ids.add(source)
+        adjacency = self._build_adjacency(edges)
+        connected_ids = matched_ids.union(*(adjacency.get(node_id, ()) for node_id in matched_ids))
         
         # Filter nodes to neighborhood only
         filtered_nodes = []
@@ -235,8 +406,7 @@ class GraphBuilder:
             if node['data']['id'] in connected_ids:
                 # Highlight searched nodes
                 if node['data']['id'] in matched_ids:
-                    node['style']['border-color'] = '#FFD700'
-                    node['style']['border-width'] = 4
+                    self._add_class(node, SEARCH_MATCH_CLASS)
                 filtered_nodes.append(node)
         
         # Filter edges to neighborhood only
@@ -249,25 +419,154 @@ class GraphBuilder:
         logger.info(f"Neighborhood filter: {len(filtered_nodes)} nodes, {len(filtered_edges)} edges")
         return filtered_nodes, filtered_edges
     
-    def _calculate_node_size(self, component, sizing_mode):
-        """Calculate node size based on sizing mode."""
-        base_size = 20
-        size_multiplier = 2
-        max_size = 60
+    def _neighborhood_by_id(self, nodes, edges, matches):
+        """
+        apply_neighborhood_filter for the graph from the last create_graph_data call.
+        
+        Works on the integer component ids kept parallel to its nodes and edges,
+        with sorted-array membership tests instead of sets of id strings.
+        """
+        matches = np.asarray(matches, dtype=bool)
+        matched_ids = self._node_ids[matches]
+        if not len(matched_ids):
+            # No matches, return original
+            return nodes, edges
+        
+        # Matched nodes plus the far end of every edge touching one
+        sources, targets = self._edge_sources, self._edge_targets
+        connected_ids = np.union1d(matched_ids, np.concatenate((
+            targets[np.isin(sources, matched_ids)],
+            sources[np.isin(targets, matched_ids)]
+        )))
+        
+        filtered_nodes = []
+        for i in np.flatnonzero(np.isin(self._node_ids, connected_ids)):
+            node = nodes[i]
+            # Highlight searched nodes
+            if matches[i]:
+                self._add_class(node, SEARCH_MATCH_CLASS)
+            filtered_nodes.append(node)
+        
+        edge_mask = np.isin(sources, connected_ids) & np.isin(targets, connected_ids)
+        filtered_edges = [edges[i] for i in np.flatnonzero(edge_mask)]
+        
+        logger.info(f"Neighborhood filter: {len(filtered_nodes)} nodes, {len(filtered_edges)} edges")
+        return filtered_nodes, filtered_edges
+    
+    def _node_columns(self, components_df, sizing_mode):
+        """
+        Node data fields as parallel columns (structure of arrays).
+        
+        Columns are plain lists so values stay Python objects, which the
+        Cytoscape widget and JSON export can serialize.
+        
+        Args:
+            components_df (pd.DataFrame): Components data
+            sizing_mode (str): Node sizing strategy
+            
+        Returns:
+            dict: Node data key -> list of values, one per component
+        """
+        n = len(components_df)
+        
+        def column(name, default=''):
+            if name in components_df.columns:
+                return components_df[name].tolist()
+            return [default] * n
+        
+        comp_ids = column('component_id', None)
+        fqdns = components_df['fqdn'].tolist()
+        comp_types = components_df['component_type'].tolist()
+        locations = components_df['physical_location'].tolist()
+        
+        # Create label - short name from FQDN (precomputed at load when available)
+        if 'node_label' in components_df.columns:
+            labels = components_df['node_label'].tolist()
+        else:
+            labels = node_label_columns(components_df)['node_label'].tolist()
+        
+        # Precomputed at load when available
+        if 'node_color' in components_df.columns:
+            colors = components_df['node_color'].tolist()
+        else:
+            colors = node_color_column(components_df, self.component_colors).tolist()
+        
+        # tolist() keeps sizes as Python ints for the widget/JSON
+        sizes = self.compute_node_sizes(components_df, sizing_mode).tolist()
+        
+        return {
+            'id': [str(comp_id) for comp_id in comp_ids],
+            'label': labels,
+            'name': fqdns,
+            'app_code': column('app_code'),
+            'type': comp_types,
+            'subtype': column('component_subtype'),
+            'ip': column('ip'),
+            'mac': column('mac'),
+            'location': locations,
+            'vlan': column('vlan'),
+            'port': column('port'),
+            'protocol': column('protocol_name'),
+            'quality': column('record_quality_grade'),
+            'connections': column('total_relationship_count', 0),
+            'size': sizes,
+            'bgColor': colors,  # Move color to data for data-driven styling
+            # FK IDs for tooltips
+            'component_id': comp_ids,
+            'type_id': column('component_type_id', None),
+            'subtype_id': column('component_subtype_id', None),
+            'location_id': column('physical_location_id', None),
+            'protocol_id': column('protocol_id', None),
+            'environment_id': column('environment_id', None),
+            # Searchable fields lowercased once per build, NUL-joined so one substring test covers all
+            '_search_blob': self._search_blob_column(components_df).tolist()
+        }
+    
+    @staticmethod
+    def _add_class(element, class_name):
+        """Add a Cytoscape class to a node/edge dict's space-separated classes."""
+        classes = element.get('classes', '')
+        if class_name not in classes.split():
+            element['classes'] = f'{classes} {class_name}' if classes else class_name
+    
+    # Node size (px) = base + multiplier * count, capped; uniform mode uses a fixed size
+    NODE_BASE_SIZE = 20
+    NODE_SIZE_MULTIPLIER = 2
+    NODE_MAX_SIZE = 60
+    NODE_UNIFORM_SIZE = 30
+    
+    @classmethod
+    def compute_node_sizes(cls, components_df, sizing_mode):
+        """
+        Node size per component for a sizing mode, in one vectorized pass.
         
+        Args:
+            components_df (pd.DataFrame): Components data
+            sizing_mode (str): Node sizing strategy
+            
+        Returns:
+            np.ndarray: Integer sizes in px, parallel to components_df
+                (counts from absent source columns are taken as 0)
+        """
+        n = len(components_df)
         if sizing_mode == 'uniform':
-            return 30
-        elif sizing_mode == 'hierarchical':
-            count = component.get('child_count', 0)
+            return np.full(n, cls.NODE_UNIFORM_SIZE, dtype=np.int64)
+        
+        if sizing_mode == 'hierarchical':
+            count_columns = ('child_count',)
         elif sizing_mode == 'dependencies':
-            count = (component.get('relationship_from_count', 0) + 
-                    component.get('relationship_to_count', 0))
+            count_columns = ('relationship_from_count', 'relationship_to_count')
         elif sizing_mode == 'peer':
-            count = component.get('peer_relationship_count', 0)
+            count_columns = ('peer_relationship_count',)
         else:  # combined
-            count = component.get('total_relationship_count', 0)
+            count_columns = ('total_relationship_count',)
+        
+        counts = np.zeros(n, dtype=np.int64)
+        for name in count_columns:
+            if name in components_df.columns:
+                counts += components_df[name].to_numpy(dtype=np.int64)
         
-        return min(base_size + (count * size_multiplier), max_size)
+        return np.minimum(cls.NODE_BASE_SIZE + counts * cls.NODE_SIZE_MULTIPLIER, cls.NODE_MAX_SIZE)
     
     def _create_hierarchical_edge(self, comp):
         """Create hierarchical edge."""
@@ -279,53 +578,32 @@ class GraphBuilder:
                 'type': 'hierarchical',
                 'label': 'parent→child'
             },
-            'style': {
-                'line-color': '#424242',
-                'line-style': 'solid',
-                'target-arrow-color': '#424242',
-                'target-arrow-shape': 'triangle',
-                'width': 2,
-                'curve-style': 'straight'
-            }
+            'classes': 'hierarchical'
         }
     
-    def _create_dependency_edge(self, rel):
-        """Create dependency edge."""
-        return {
-            'data': {
-                'id': f"dep_{rel['component_id']}_{rel['related_component_id']}",
-                'source': str(rel['component_id']),
-                'target': str(rel['related_component_id']),
-                'type': 'dependency',
-                'label': rel.get('relationship_type', 'dependency')
-            },
-            'style': {
-                'line-color': '#616161',
-                'line-style': 'dashed',
-                'target-arrow-color': '#616161',
-                'target-arrow-shape': 'triangle',
-                'width': 2,
-                'curve-style': 'straight'
-            }
-        }
-    
-    def _create_peer_edge(self, rel):
-        """Create peer relationship edge."""
-        return {
-            'data': {
-                'id': f"peer_{rel['component_id']}_{rel['related_component_id']}",
-                'source': str(rel['component_id']),
-                'target': str(rel['related_component_id']),
-                'type': 'peer',
-                'label': rel.get('relationship_type', 'peer')
-            },
-            'style': {
-                'line-color': '#757575',
-                'line-style': 'dotted',
-                'width': 2,
-                'curve-style': 'straight'
+    @staticmethod
+    def _build_edges(id_prefix, edge_type, sources, targets, labels):
+        """
+        Build edge dicts for one relationship kind.
+        
+        Args:
+            id_prefix (str): Edge id prefix, e.g. 'dep'
+            edge_type (str): Edge type stored in data, also its stylesheet class
+            sources, targets (pd.Series): Stringified component ids
+            labels (pd.Series): Relationship type names
+            
+        Returns:
+            list: Edge dictionaries
+        """
+        ids = (id_prefix + '_' + sources + '_' + targets).tolist()
+        return [
+            {
+                'data': {'id': edge_id, 'source': source, 'target': target,
+                         'type': edge_type, 'label': label},
+                'classes': edge_type
             }
-        }
+            for edge_id, source, target, label in zip(ids, sources.tolist(), targets.tolist(), labels.tolist())
+        ]
     
     def get_layout_config(self, layout_name):
         """
@@ -335,28 +613,9 @@ class GraphBuilder:
             layout_name (str): Layout algorithm name
             
         Returns:
-            dict: Layout configuration
+            dict: Layout configuration (shared; do not mutate)
         """
-        configs = {
-            'dagre': {
-                'name': 'dagre',
-                'rankDir': 'TB',
-                'spacingFactor': 1.5
-            },
-            'cose': {
-                'name': 'cose',
-                'idealEdgeLength': 100,
-                'nodeOverlap': 20
-            },
-            'circle': {
-                'name': 'circle'
-            },
-            'grid': {
-                'name': 'grid'
-            }
-        }
-        
-        config = configs.get(layout_name, {'name': layout_name})
+        config = _LAYOUT_CONFIGS.get(layout_name, {'name': layout_name})
         logger.debug(f"Using layout: {layout_name}")
         return config
 
@@ -366,27 +625,6 @@ def get_graph_styles():
     Get cytoscape style definitions.
     
     Returns:
-        list: Style definitions for cytoscape
+        list: Style definitions for cytoscape (shared; do not mutate)
     """
-    return [
-        {
-            'selector': 'node',
-            'style': {
-                'content': 'data(label)',
-                'text-valign': 'center',
-                'text-halign': 'center',
-                'font-family': 'Arial, sans-serif',
-                'font-weight': 'bold',
-                'background-color': 'data(bgColor)'  # Data-driven color
-            }
-        },
-        {
-            'selector': 'edge',
-            'style': {
-                'content': 'data(label)',
-                'font-size': '8px',
-                'text-rotation': 'autorotate',
-                'text-margin-y': -10
-            }
-        }
-    ]
\ No newline at end of file
+    return _GRAPH_STYLES
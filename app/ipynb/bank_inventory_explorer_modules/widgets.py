@@ -8,12 +8,46 @@ from IPython.display import HTML
 
 logger = logging.getLogger(__name__)
 
+# Status banner per schema; unknown schemas fall back to the demo banner
+_STATUS_HTML = {
+    'live': '''
+        <div style="background-color: #ffebee; color: #c62828; padding: 10px;
+                    border-radius: 5px; border-left: 4px solid #f44336;">
+            <strong>🔴 LIVE</strong> - Production Data with Authentication
+        </div>
+        ''',
+    'live_masked': '''
+        <div style="background-color: #fff3e0; color: #e65100; padding: 10px;
+                    border-radius: 5px; border-left: 4px solid #ff9800;">
+            <strong>🟠 LIVE_MASKED</strong> - Production Data (Sensitive Info Hidden)
+        </div>
+        ''',
+    'demo': '''
+        <div style="background-color: #e3f2fd; color: #1565c0; padding: 10px;
+                    border-radius: 5px; border-left: 4px solid #2196f3;">
+            <strong>🟦 DEMO</strong> - Sample Data for Testing
+        </div>
+        ''',
+}
+
+_SECTION_TMPL = '''
+    <h3 style="color: #1565C0; border-bottom: 2px solid #1565C0; 
+               padding-bottom: 5px; margin-top: 20px;">
+        {icon} {title}
+    </h3>
+    '''
+
+# One Layout model shared by the refresh/export buttons
+_BUTTON_LAYOUT = widgets.Layout(width='150px')
+
 
 class WidgetManager:
     """
     Manages widget state and references.
     """
-    
+
+    __slots__ = ('widgets',)
+
     def __init__(self):
         """Initialize widget manager."""
         self.widgets = {}
@@ -22,7 +56,7 @@ class WidgetManager:
     def register(self, name, widget):
         """Register a widget."""
         self.widgets[name] = widget
-        logger.debug(f"Registered widget: {name}")
+        logger.debug("Registered widget: %s", name)
     
     def get(self, name):
         """Get a registered widget."""
@@ -60,7 +94,7 @@ def create_schema_selector(initial_value='demo', on_change=None):
     if on_change:
         selector.observe(on_change, names='value')
 
-    logger.debug(f"Created schema selector with initial value: {initial_value}")
+    logger.debug("Created schema selector with initial value: %s", initial_value)
     return selector
 
 
@@ -85,36 +119,29 @@ def create_status_indicator(schema):
     """
     Create status indicator for current schema.
 
+    Keep the returned widget and pass it to update_status_indicator on
+    schema changes instead of creating a new one.
+
     Args:
         schema (str): Current schema name
 
     Returns:
         widgets.HTML: Status indicator widget
     """
-    if schema == 'live':
-        html = '''
-        <div style="background-color: #ffebee; color: #c62828; padding: 10px;
-                    border-radius: 5px; border-left: 4px solid #f44336;">
-            <strong>🔴 LIVE</strong> - Production Data with Authentication
-        </div>
-        '''
-    elif schema == 'live_masked':
-        html = '''
-        <div style="background-color: #fff3e0; color: #e65100; padding: 10px;
-                    border-radius: 5px; border-left: 4px solid #ff9800;">
-            <strong>🟠 LIVE_MASKED</strong> - Production Data (Sensitive Info Hidden)
-        </div>
-        '''
-    else:  # demo
-        html = '''
-        <div style="background-color: #e3f2fd; color: #1565c0; padding: 10px;
-                    border-radius: 5px; border-left: 4px solid #2196f3;">
-            <strong>🟦 DEMO</strong> - Sample Data for Testing
-        </div>
-        '''
+    logger.debug("Created status indicator for schema: %s", schema)
+    return widgets.HTML(value=_STATUS_HTML.get(schema, _STATUS_HTML['demo']))
 
-    logger.debug(f"Created status indicator for schema: {schema}")
-    return widgets.HTML(value=html)
+
+def update_status_indicator(indicator, schema):
+    """
+    Point an existing status indicator at a new schema.
+
+    Args:
+        indicator (widgets.HTML): Widget from create_status_indicator
+        schema (str): Current schema name
+    """
+    indicator.value = _STATUS_HTML.get(schema, _STATUS_HTML['demo'])
+    logger.debug("Updated status indicator for schema: %s", schema)
 
 
 def create_refresh_button(on_click, label='🔄 Refresh'):
@@ -131,13 +158,13 @@ def create_refresh_button(on_click, label='🔄 Refresh'):
     button = widgets.Button(
         description=label,
         button_style='info',
-        layout=widgets.Layout(width='150px')
+        layout=_BUTTON_LAYOUT
     )
     
     if on_click:
         button.on_click(on_click)
     
-    logger.debug(f"Created refresh button: {label}")
+    logger.debug("Created refresh button: %s", label)
     return button
 
 
@@ -162,10 +189,10 @@ def create_export_button(export_type):
     button = widgets.Button(
         description=label,
         button_style=style,
-        layout=widgets.Layout(width='150px')
+        layout=_BUTTON_LAYOUT
     )
     
-    logger.debug(f"Created export button: {export_type}")
+    logger.debug("Created export button: %s", export_type)
     return button
 
 
@@ -184,7 +211,7 @@ def create_layout_selector():
         layout=widgets.Layout(width='200px')
     )
     
-    logger.debug(f"Created layout selector: {selector.value}")
+    logger.debug("Created layout selector: %s", selector.value)
     return selector
 
 
@@ -204,7 +231,7 @@ def create_sizing_selector():
         layout=widgets.Layout(width='250px')
     )
     
-    logger.debug(f"Created sizing selector: {selector.value}")
+    logger.debug("Created sizing selector: %s", selector.value)
     return selector
 
 
@@ -269,14 +296,7 @@ def create_section_header(title, icon=''):
     Returns:
         widgets.HTML: Section header
     """
-    html = f'''
-    <h3 style="color: #1565C0; border-bottom: 2px solid #1565C0; 
-               padding-bottom: 5px; margin-top: 20px;">
-        {icon} {title}
-    </h3>
-    '''
-    
-    return widgets.HTML(value=html)
+    return widgets.HTML(value=_SECTION_TMPL.format_map({'icon': icon, 'title': title}))
 
 
 def create_output_area(height='400px'):
@@ -298,7 +318,7 @@ def create_output_area(height='400px'):
         )
     )
     
-    logger.debug(f"Created output area with height: {height}")
+    logger.debug("Created output area with height: %s", height)
     return output
 
 
@@ -0,0 +1,8 @@
+"""
+Make bank_inventory_explorer_modules importable the way the notebook imports it.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,42 @@
+"""
+Tests for CSV export serialization.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from bank_inventory_explorer_modules import export
+
+
+def _pandas_csv(dataframe):
+    return dataframe.to_csv(index=False).encode('utf-8')
+
+
+@pytest.fixture
+def large_frame():
+    """Mixed-dtype frame just above the Arrow writer threshold."""
+    rows = export.ARROW_CSV_MIN_ROWS + 1
+    pattern = np.arange(rows) % 3
+    return pd.DataFrame({
+        'component_id': np.arange(rows, dtype='int32'),
+        'fqdn': pd.Series(['app01.bank.local', 'db02.bank.local', None])[pattern].to_numpy(),
+        'component_type': pd.Categorical(['server', 'database', 'load_balancer'])[pattern],
+        'port': pd.array([443, None, 5432], dtype='Int64')[pattern],
+        'score': np.array([1.5, np.nan, 2.0])[pattern],
+        'is_active': np.array([True, False, True])[pattern],
+        'updated_at': pd.to_datetime(
+            ['2024-01-02 03:04:05', None, '2024-06-30 23:59:59'], utc=True
+        )[pattern],
+    })
+
+
+def test_arrow_csv_matches_pandas(large_frame):
+    assert bytes(export._csv_bytes(large_frame)) == _pandas_csv(large_frame)
+
+
+def test_values_needing_quotes_match_pandas(large_frame):
+    frame = large_frame.assign(fqdn='web, "primary"')
+    assert bytes(export._csv_bytes(frame)) == _pandas_csv(frame)
@@ -23,10 +23,14 @@ Usage:
 import os
 import sys
 import subprocess
+import threading
 import argparse
+import mmap
 import re
+from collections import Counter
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -37,44 +41,66 @@ if env_file.exists():
 else:
     print(f"⚠️  No .env file found at {env_file}, using system environment")
 
+# Start-of-section marker line in the SQL file; its END SECTION counterpart is found with str.find
+SECTION_RE = re.compile(rb'^-- =+ SECTION: ([\w:]+) =+\r?\n', re.MULTILINE)
+SECTION_END_MARKER = '-- ==================== END SECTION: {name} ===================='
+
+# Markers echoed between sections when several run in one psql session
+SECTION_MARKER = ':::SECTION:{name}:{edge}'
+
+
 class BaisSchemaManager:
     """Manages BAIS database schema setup"""
     
     def __init__(self):
         self.script_dir = Path(__file__).parent.parent
         self.sql_file = self.script_dir.parent / 'database' / 'bais_database_schema.sql'
-        self.sections = {}
-        self._load_sections()
-    
-    def _load_sections(self):
-        """Parse SQL file and extract sections"""
+        self._sql_map = None
         if not self.sql_file.exists():
             raise FileNotFoundError(f"SQL file not found: {self.sql_file}")
-        
-        with open(self.sql_file, 'r') as f:
-            content = f.read()
-        
-        # Pattern to match section markers
-        section_pattern = r'-- ==================== SECTION: ([\w:]+) ====================\n(.*?)-- ==================== END SECTION: \1 ===================='
-        
-        matches = re.finditer(section_pattern, content, re.DOTALL)
-        
-        for match in matches:
-            section_name = match.group(1)
-            section_content = match.group(2)
-            self.sections[section_name] = section_content
-        
-        print(f"📋 Loaded {len(self.sections)} sections from SQL file")
     
-    def get_connection_url(self) -> str:
-        """Get rc34924 connection URL from environment"""
+    @cached_property
+    def sections(self) -> Dict[str, memoryview]:
+        """Section name -> memoryview into the mapped SQL file (decoded when run), loaded on first use"""
+        # Map the file instead of reading it; sections are zero-copy slices of the mapping
+        with open(self.sql_file, 'rb') as f:
+            if self.sql_file.stat().st_size:
+                self._sql_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._sql_map is None:
+            return {}
+        
+        index = self._parse_section_index()
+        content = memoryview(self._sql_map)
+        sections = {name: content[start:end] for name, (start, end) in index.items()}
+        print(f"📋 Loaded {len(sections)} sections from SQL file")
+        return sections
+    
+    def _parse_section_index(self) -> Dict[str, tuple]:
+        """Scan the mapped SQL file for section byte offsets"""
+        index = {}
+        # One pass over the start markers; each body runs up to its own end marker
+        for match in SECTION_RE.finditer(self._sql_map):
+            section_name = match.group(1).decode('utf-8')
+            end_marker = SECTION_END_MARKER.format(name=section_name).encode('utf-8')
+            end = self._sql_map.find(end_marker, match.end())
+            if end != -1:
+                index[section_name] = (match.end(), end)
+        return index
+    
+    @cached_property
+    def connection_url(self) -> str:
+        """rc34924 connection URL from environment (resolved once)"""
         url = os.getenv('POSTGRESQL_BAIS_DB_ADMIN_URL')
         if not url:
-            # Build from components
+            # Build from components; only the password has no usable default
+            password = os.getenv('POSTGRESQL_BAIS_DB_ADMIN_PASSWORD')
+            if not password:
+                raise RuntimeError(
+                    "Set POSTGRESQL_BAIS_DB_ADMIN_URL or POSTGRESQL_BAIS_DB_ADMIN_PASSWORD"
+                )
             host = os.getenv('POSTGRESQL_INSTANCE_HOST', '0.0.0.0')
             port = os.getenv('POSTGRESQL_INSTANCE_PORT', '5432')
             user = os.getenv('POSTGRESQL_BAIS_DB_ADMIN_USER', 'rc34924')
-            password = os.getenv('POSTGRESQL_BAIS_DB_ADMIN_PASSWORD', 'cBmVWgt8uzvyKj54x3E4Tn6s')
             database = os.getenv('POSTGRESQL_BAIS_DB', 'prutech_bais')
             url = f"postgresql://{user}:{password}@{host}:{port}/{database}?sslmode=disable"
         return url
@@ -103,31 +129,19 @@ class BaisSchemaManager:
         
         print(f"\n🚀 Executing: {description}")
         
-        url = self.get_connection_url()
+        tally = Counter()
+        
+        def on_line(line):
+            tally[line.split(' ', 1)[0]] += 1
         
         try:
-            result = subprocess.run(
-                ['psql', url, '-c', sql_content],
-                capture_output=True,
-                text=True
-            )
+            returncode = self._stream_psql(sql_content, on_line)
             
-            if result.returncode != 0:
-                print(f"❌ ERROR executing SQL:")
-                print(result.stderr)
+            if returncode != 0:
+                print(f"❌ ERROR executing SQL (see psql messages above)")
                 return 1
             
-            # Count operations
-            creates = result.stdout.count('CREATE')
-            grants = result.stdout.count('GRANT')
-            inserts = result.stdout.count('INSERT')
-            
-            print(f"   ✓ {creates} objects created")
-            if grants > 0:
-                print(f"   ✓ {grants} permissions granted")
-            if inserts > 0:
-                print(f"   ✓ {inserts} data rows inserted")
-            
+            self._print_counts(tally)
             return 0
             
         except FileNotFoundError:
@@ -137,6 +151,70 @@ class BaisSchemaManager:
             print(f"❌ ERROR: {e}")
             return 1
     
+    def _stream_psql(self, script: str, on_line) -> int:
+        """
+        Run a SQL script in one psql session and transaction, streaming its output.
+        
+        Each stdout line (command tags, echoed markers) is passed to on_line as
+        psql prints it; stderr lines (notices, errors) are printed immediately.
+        
+        Returns:
+            psql exit code
+        """
+        proc = subprocess.Popen(
+            ['psql', '-v', 'ON_ERROR_STOP=1', '--single-transaction', '-f', '-', self.connection_url],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        
+        # Feed stdin and drain stderr on their own threads so no pipe can fill up and stall psql
+        def feed():
+            try:
+                proc.stdin.write(script)
+            except BrokenPipeError:
+                pass  # psql exited early; its exit code reports why
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+        
+        def drain_stderr():
+            for line in proc.stderr:
+                print(f"   {line.rstrip()}")
+        
+        workers = [threading.Thread(target=feed), threading.Thread(target=drain_stderr)]
+        for worker in workers:
+            worker.start()
+        for line in proc.stdout:
+            on_line(line.rstrip('\n'))
+        for worker in workers:
+            worker.join()
+        return proc.wait()
+    
+    def _print_counts(self, tally: Counter):
+        """Summarize the command tags psql printed for a section"""
+        creates, grants, inserts = tally['CREATE'], tally['GRANT'], tally['INSERT']
+        
+        print(f"   ✓ {creates} objects created")
+        if grants > 0:
+            print(f"   ✓ {grants} permissions granted")
+        if inserts > 0:
+            print(f"   ✓ {inserts} data rows inserted")
+    
+    def _section_sql(self, section_name: str) -> str:
+        """SQL to run for a section"""
+        sql_content = bytes(self.sections[section_name]).decode('utf-8')
+        
+        # Add search path reset for schema sections
+        if section_name.startswith('SCHEMA:'):
+            sql_content = "SET search_path TO public;\n" + sql_content
+        
+        return sql_content
+    
     def run_section(self, section_name: str, dry_run: bool = True) -> int:
         """Run a specific section"""
         if section_name not in self.sections:
@@ -144,16 +222,10 @@ class BaisSchemaManager:
             self.list_sections()
             return 1
         
-        sql_content = self.sections[section_name]
-        
-        # Add search path reset for schema sections
-        if section_name.startswith('SCHEMA:'):
-            sql_content = "SET search_path TO public;\n" + sql_content
-        
-        return self.execute_sql(sql_content, f"Section {section_name}", dry_run)
+        return self.execute_sql(self._section_sql(section_name), f"Section {section_name}", dry_run)
     
-    def run_all(self, dry_run: bool = True) -> int:
-        """Run all sections in order"""
+    def run_all(self, dry_run: bool = True, per_section: bool = False) -> int:
+        """Run all sections in order (one batch by default, or one psql call per section)"""
         
         # Define execution order
         section_order = [
@@ -175,17 +247,64 @@ class BaisSchemaManager:
         
         print(f"\n🚀 Running all {len(section_order)} sections...")
         
-        for i, section in enumerate(section_order, 1):
-            print(f"\n[{i}/{len(section_order)}] Processing {section}...")
-            
+        sections = []
+        for section in section_order:
             if section not in self.sections:
                 print(f"⚠️  WARNING: Section '{section}' not found, skipping")
                 continue
+            sections.append(section)
+        
+        if per_section:
+            # Separate psql call and transaction per section (debugging aid)
+            for i, section in enumerate(sections, 1):
+                print(f"\n[{i}/{len(sections)}] Processing {section}...")
+                result = self.run_section(section, dry_run=False)
+                if result != 0:
+                    print(f"❌ Failed at section {section}")
+                    return result
             
-            result = self.run_section(section, dry_run=False)
-            if result != 0:
-                print(f"❌ Failed at section {section}")
-                return result
+            print("\n✅ All sections completed successfully!")
+            return 0
+        
+        # One psql session (one connection) for all sections, in one transaction;
+        # echoed markers delimit each section's output
+        script = ''.join(
+            f"\\echo {SECTION_MARKER.format(name=section, edge='BEGIN')}\n"
+            f"{self._section_sql(section)}\n"
+            f"\\echo {SECTION_MARKER.format(name=section, edge='END')}\n"
+            for section in sections
+        )
+        
+        # Progress is reported as psql reaches each section's markers
+        started = []
+        tally = Counter()
+        
+        def on_line(line):
+            if line.startswith(':::SECTION:'):
+                name, edge = line[len(':::SECTION:'):].rsplit(':', 1)
+                if edge == 'BEGIN':
+                    started.append(name)
+                    tally.clear()
+                    print(f"\n[{len(started)}/{len(sections)}] Processing {name}...")
+                else:
+                    self._print_counts(tally)
+            else:
+                tally[line.split(' ', 1)[0]] += 1
+        
+        try:
+            returncode = self._stream_psql(script, on_line)
+        except FileNotFoundError:
+            print("❌ ERROR: psql not found. Please install PostgreSQL client.")
+            return 1
+        except RuntimeError as e:
+            print(f"❌ ERROR: {e}")
+            return 1
+        
+        if returncode != 0:
+            failed = started[-1] if started else (sections[0] if sections else None)
+            print(f"❌ ERROR executing SQL (see psql messages above)")
+            print(f"❌ Failed at section {failed} (all sections rolled back)")
+            return 1
         
         print("\n✅ All sections completed successfully!")
         return 0
@@ -290,6 +409,12 @@ Environment variables required:
         help='Actually execute SQL (default is dry-run)'
     )
     
+    parser.add_argument(
+        '--per-section',
+        action='store_true',
+        help='Run each section in its own psql call and transaction (debugging)'
+    )
+    
     args = parser.parse_args()
     
     # Initialize manager
@@ -352,7 +477,7 @@ Environment variables required:
             print("❌ Cancelled by user")
             sys.exit(1)
         
-        sys.exit(manager.run_all(dry_run=False))
+        sys.exit(manager.run_all(dry_run=False, per_section=args.per_section))
 
 if __name__ == '__main__':
     main()
@@ -26,9 +26,13 @@ Usage:
 import os
 import sys
 import argparse
+import itertools
+import mmap
 import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 
 try:
@@ -38,6 +42,48 @@ except ImportError:
     print("❌ ERROR: psycopg3 not installed. Run: pip install 'psycopg[binary]'")
     sys.exit(1)
 
+# Errors meaning the object already exists - skipped for idempotency
+DUPLICATE_ERRORS = (
+    psycopg.errors.DuplicateObject,
+    psycopg.errors.DuplicateDatabase,
+    psycopg.errors.DuplicateTable,
+)
+
+# Section markers in the SQL file; group 2 is the section body
+SECTION_RE = re.compile(
+    rb'-- ==================== SECTION: ([\w:]+) ====================\r?\n(.*?)'
+    rb'-- ==================== END SECTION: \1 ====================',
+    re.DOTALL
+)
+
+# Sections sent to the server as one multi-statement string, skipping the
+# splitter; they are idempotent as written (IF NOT EXISTS / OR REPLACE / GRANT),
+# so they need no per-statement duplicate handling
+SINGLE_SHOT_SECTIONS = frozenset({'USER_CREATION', 'DATABASE_PREREQUISITES', 'PERMISSIONS'})
+
+# Statement-leading verbs, for counting what a section did
+VERB_RE = re.compile(r'^\s*(CREATE|GRANT|INSERT)\b', re.IGNORECASE | re.MULTILINE)
+
+# Tokens the statement splitter cares about: comments, quoted regions and the terminator
+SQL_TOKEN_RE = re.compile(
+    r"(?P<comment>--[^\n]*|/\*.*?\*/)"
+    r"|[Ee]'(?:[^'\\]|\\.|'')*'"
+    r"|'(?:[^']|'')*'"
+    r'|"(?:[^"]|"")*"'
+    r"|\$(?P<tag>[A-Za-z_]\w*|)\$.*?\$(?P=tag)\$"
+    r"|(?P<end>;)",
+    re.DOTALL
+)
+
+# INSERT ... VALUES statement whose rows may be loadable with COPY
+INSERT_RE = re.compile(r'\s*INSERT\s+INTO\s+([\w.]+)\s*\(([^)]*)\)\s*VALUES\s*(.*)', re.IGNORECASE | re.DOTALL)
+
+# One token of a VALUES list: string, number, NULL/boolean, punctuation or a comment
+VALUES_TOKEN_RE = re.compile(
+    r"\s*(?:'((?:[^']|'')*)'|(-?\d+(?:\.\d+)?)\b|(NULL|TRUE|FALSE)\b|([(),])|--[^\n]*)",
+    re.IGNORECASE
+)
+
 # Load environment variables from .env file
 env_file = Path(__file__).parent.parent.parent.parent / '.env'
 if env_file.exists():
@@ -52,7 +98,9 @@ class BaisSchemaManagerPsycopg:
     def __init__(self):
         self.script_dir = Path(__file__).parent.parent
         self.sql_file = self.script_dir.parent / 'database' / 'bais_database_schema.sql'
+        # Section name -> memoryview into the mapped SQL file (decoded by get_section)
         self.sections = {}
+        self._sql_map = None
         self._load_sections()
     
     def _load_sections(self):
@@ -60,21 +108,23 @@ class BaisSchemaManagerPsycopg:
         if not self.sql_file.exists():
             raise FileNotFoundError(f"SQL file not found: {self.sql_file}")
         
-        with open(self.sql_file, 'r') as f:
-            content = f.read()
-        
-        # Pattern to match section markers
-        section_pattern = r'-- ==================== SECTION: ([\w:]+) ====================\n(.*?)-- ==================== END SECTION: \1 ===================='
+        # Map the file instead of reading it; the OS pages in only what is used
+        with open(self.sql_file, 'rb') as f:
+            if self.sql_file.stat().st_size:
+                self._sql_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         
-        matches = re.finditer(section_pattern, content, re.DOTALL)
-        
-        for match in matches:
-            section_name = match.group(1)
-            section_content = match.group(2)
-            self.sections[section_name] = section_content
+        if self._sql_map is not None:
+            content = memoryview(self._sql_map)
+            for match in SECTION_RE.finditer(self._sql_map):
+                start, end = match.span(2)
+                self.sections[match.group(1).decode('utf-8')] = content[start:end]
         
         print(f"📋 Loaded {len(self.sections)} sections from SQL file")
     
+    def get_section(self, section_name: str) -> str:
+        """SQL text of a section"""
+        return bytes(self.sections[section_name]).decode('utf-8')
+    
     def get_connection_params(self) -> Dict[str, str]:
         """Get rc34924 connection parameters from environment"""
         # Try complete URL first
@@ -91,15 +141,29 @@ class BaisSchemaManagerPsycopg:
                 'dbname': parsed.path.lstrip('/') if parsed.path else 'prutech_bais'
             }
         
-        # Build from components
+        # Build from components; only the password has no usable default
+        password = os.getenv('POSTGRESQL_BAIS_DB_ADMIN_PASSWORD')
+        if not password:
+            raise RuntimeError(
+                "Set POSTGRESQL_BAIS_DB_ADMIN_URL or POSTGRESQL_BAIS_DB_ADMIN_PASSWORD"
+            )
         return {
             'host': os.getenv('POSTGRESQL_INSTANCE_HOST', '0.0.0.0'),
             'port': int(os.getenv('POSTGRESQL_INSTANCE_PORT', '5432')),
             'user': os.getenv('POSTGRESQL_BAIS_DB_ADMIN_USER', 'rc34924'),
-            'password': os.getenv('POSTGRESQL_BAIS_DB_ADMIN_PASSWORD', 'cBmVWgt8uzvyKj54x3E4Tn6s'),
+            'password': password,
             'dbname': os.getenv('POSTGRESQL_BAIS_DB', 'prutech_bais')
         }
     
+    def connect(self):
+        """Open a psycopg connection as rc34924"""
+        conn = psycopg.connect(**self.get_connection_params())
+        # Prepare server-side from a statement's second execution (psycopg
+        # matches statements by SQL text) instead of the default fifth
+        conn.prepare_threshold = 1
+        conn.prepared_max = 1000
+        return conn
+    
     def list_sections(self):
         """List available sections"""
         print("\n📚 Available sections:")
@@ -110,118 +174,107 @@ class BaisSchemaManagerPsycopg:
                 print(f"   • {name}")
     
     def split_sql_statements(self, sql_content: str) -> List[str]:
-        """Split SQL content into individual statements"""
-        # Handle DO blocks specially - they contain semicolons but are one statement
-        statements = []
-        
-        # Check if this contains dollar-quoted blocks (DO blocks or functions)
-        if '$$' in sql_content:
-            # Handle dollar-quoted sections as single statements
-            current_pos = 0
-            content = sql_content
-            
-            while current_pos < len(content):
-                # Find next $$
-                dollar_start = content.find('$$', current_pos)
-                
-                if dollar_start == -1:
-                    # No more dollar quotes - process remainder
-                    remaining = content[current_pos:].strip()
-                    if remaining:
-                        for stmt in self._split_regular_sql(remaining):
-                            if stmt:
-                                statements.append(stmt)
-                    break
-                
-                # Process SQL before the $$
-                before = content[current_pos:dollar_start].strip()
-                if before and not before.endswith('AS') and not before.endswith('DO'):
-                    for stmt in self._split_regular_sql(before):
-                        if stmt:
-                            statements.append(stmt)
-                
-                # Find the matching closing $$
-                # Look backwards from $$ to find the statement start
-                stmt_start = current_pos
-                for keyword in ['CREATE', 'DO', 'DECLARE']:
-                    idx = content.rfind(keyword, current_pos, dollar_start)
-                    if idx != -1:
-                        stmt_start = idx
-                        break
-                
-                # Find the ending $$ and semicolon
-                dollar_end = content.find('$$', dollar_start + 2)
-                if dollar_end != -1:
-                    # Look for the statement-ending semicolon
-                    semi = content.find(';', dollar_end + 2)
-                    if semi != -1:
-                        # Include the full statement
-                        full_stmt = content[stmt_start:semi + 1].strip()
-                        if full_stmt:
-                            statements.append(full_stmt)
-                        current_pos = semi + 1
-                    else:
-                        # No semicolon found - take to end
-                        full_stmt = content[stmt_start:].strip()
-                        if full_stmt:
-                            statements.append(full_stmt)
-                        break
-                else:
-                    # No closing $$ found - error but try to continue
-                    current_pos = len(content)
-        else:
-            # No DO blocks - regular splitting
-            statements = self._split_regular_sql(sql_content)
-        
-        return statements
-    
-    def _split_regular_sql(self, sql_content: str) -> List[str]:
-        """Split regular SQL (not DO blocks) into statements"""
-        # Remove comments (but keep section markers for reference)
-        lines = []
-        for line in sql_content.split('\n'):
-            # Skip comment lines (but not section markers)
-            if line.strip().startswith('--') and not line.strip().startswith('-- ===='):
-                continue
-            lines.append(line)
-        
-        # Join and split by semicolons
-        content = '\n'.join(lines)
+        """Split SQL content into individual statements (comments removed)"""
+        return list(self.iter_statements(sql_content))
+    
+    def iter_statements(self, sql_content: str) -> Iterator[str]:
+        """Yield SQL statements one at a time (comments removed), tokenizing lazily"""
+        parts = []
+        start = 0
+        
+        # Strings, quoted identifiers and dollar-quoted bodies are matched whole,
+        # so only a top-level ';' ends a statement
+        for token in SQL_TOKEN_RE.finditer(sql_content):
+            if token.group('comment') is not None:
+                parts.append(sql_content[start:token.start()])
+                start = token.end()
+            elif token.group('end'):
+                parts.append(sql_content[start:token.start()])
+                start = token.end()
+                stmt = ''.join(parts).strip()
+                if stmt:
+                    yield stmt
+                parts = []
         
-        # Split by semicolon but not within strings
-        statements = []
-        current = []
-        in_string = False
-        escape_next = False
+        # Add any remaining statement
+        parts.append(sql_content[start:])
+        stmt = ''.join(parts).strip()
+        if stmt:
+            yield stmt
+    
+    def _parse_insert(self, stmt: str) -> Optional[Tuple[str, Tuple[str, ...], List[tuple]]]:
+        """
+        Table, columns and rows of an INSERT that lists only plain literals.
         
-        for char in content:
-            if escape_next:
-                current.append(char)
-                escape_next = False
-                continue
-            
-            if char == '\\':
-                escape_next = True
-                current.append(char)
-                continue
-            
-            if char == "'" and not escape_next:
-                in_string = not in_string
+        Returns None for anything COPY can't reproduce exactly (expressions,
+        casts, ON CONFLICT, quoted identifiers, ...).
+        """
+        match = INSERT_RE.match(stmt)
+        if not match:
+            return None
+        
+        table, column_list, values = match.groups()
+        columns = tuple(column.strip().lower() for column in column_list.split(','))
+        if not all(re.fullmatch(r'\w+', column) for column in columns):
+            return None
+        
+        rows = []
+        row = None
+        pos = 0
+        values = values.rstrip().rstrip(';')
+        while pos < len(values):
+            token = VALUES_TOKEN_RE.match(values, pos)
+            if not token:
+                if values[pos:].strip():
+                    return None
+                break
+            pos = token.end()
+            string, number, keyword, punct = token.groups()
             
-            if char == ';' and not in_string:
-                stmt = ''.join(current).strip()
-                if stmt:  # Skip empty statements
-                    statements.append(stmt)
-                current = []
+            if punct == '(':
+                if row is not None:
+                    return None
+                row = []
+            elif punct == ')':
+                if row is None or len(row) != len(columns):
+                    return None
+                rows.append(tuple(row))
+                row = None
+            elif punct == ',' or (string, number, keyword) == (None, None, None):
+                continue  # separators and comments
+            elif row is None:
+                return None
+            elif string is not None:
+                row.append(string.replace("''", "'"))
+            elif number is not None:
+                row.append(number)  # COPY parses the text for the column's type
             else:
-                current.append(char)
+                row.append(None if keyword.upper() == 'NULL' else keyword.upper() == 'TRUE')
         
-        # Add any remaining statement
-        stmt = ''.join(current).strip()
-        if stmt:
-            statements.append(stmt)
+        if row is not None or not rows:
+            return None
+        return table.lower(), columns, rows
+    
+    def _coalesce_inserts(self, statements: List[str]) -> list:
+        """
+        Group statements into execution batches.
         
-        return statements
+        Consecutive literal INSERTs into the same table and columns become one
+        (table, columns, rows) COPY batch; everything else is kept, in order,
+        in lists of statements to pipeline.
+        """
+        batches = []
+        for stmt in statements:
+            parsed = self._parse_insert(stmt)
+            if parsed is None:
+                if not batches or not isinstance(batches[-1], list):
+                    batches.append([])
+                batches[-1].append(stmt)
+            elif batches and isinstance(batches[-1], tuple) and batches[-1][:2] == parsed[:2]:
+                batches[-1][2].extend(parsed[2])
+            else:
+                batches.append(parsed)
+        return batches
     
     def execute_statements(self, conn, statements: List[str], description: str, dry_run: bool = True) -> Tuple[int, int, int]:
         """Execute a list of SQL statements and return counts"""
@@ -238,46 +291,87 @@ class BaisSchemaManagerPsycopg:
                 print(f"   ... and {len(statements) - 3} more statements")
             return 0, 0, 0
         
-        creates = 0
-        grants = 0  
-        inserts = 0
+        # Binary result format: nothing is converted to and from text. Statements
+        # run one per execute here, which binary cursors require
+        with conn.cursor(binary=True) as cur:
+            try:
+                # The whole section is one explicit transaction: a single commit
+                # (one WAL flush), and anything raised rolls all of it back
+                with conn.transaction():
+                    for batch in self._coalesce_inserts(statements):
+                        if isinstance(batch, list):
+                            # Pipeline mode sends every statement before waiting on any
+                            # result: one round-trip per run instead of one per statement
+                            with conn.pipeline():
+                                for stmt in batch:
+                                    cur.execute(stmt)
+                        else:
+                            # Reference data streams through COPY (not allowed in a pipeline)
+                            table, columns, rows = batch
+                            copy_sql = sql.SQL("COPY {} ({}) FROM STDIN").format(
+                                sql.Identifier(*table.split('.')),
+                                sql.SQL(', ').join(map(sql.Identifier, columns))
+                            )
+                            with cur.copy(copy_sql) as copy:
+                                for row in rows:
+                                    copy.write_row(row)
+                executed = statements
+            except psycopg.Error:
+                # An error aborts the rest of the pipeline without saying which
+                # statement failed; replay one by one to skip duplicates or report it
+                executed = self._execute_each(conn, cur, statements)
         
-        with conn.cursor() as cur:
+        conn.commit()
+        return self._count_statements(executed)
+    
+    def _execute_each(self, conn, cur, statements: List[str]) -> List[str]:
+        """Execute statements one at a time, skipping ones whose object already exists"""
+        executed = []
+        with conn.transaction():
             for stmt in statements:
                 try:
-                    cur.execute(stmt)
-                    
-                    # Count operation types
-                    stmt_upper = stmt.upper()
-                    if 'CREATE' in stmt_upper:
-                        creates += 1
-                    elif 'GRANT' in stmt_upper:
-                        grants += 1
-                    elif 'INSERT' in stmt_upper:
-                        inserts += 1
-                        
-                except psycopg.errors.DuplicateObject:
+                    # Savepoint per statement so a duplicate doesn't abort the section
+                    with conn.transaction():
+                        cur.execute(stmt)
+                    executed.append(stmt)
+                except DUPLICATE_ERRORS:
                     # Object already exists - that's ok for idempotency
                     pass
-                except psycopg.errors.DuplicateDatabase:
-                    # Database already exists
-                    pass
-                except psycopg.errors.DuplicateTable:
-                    # Table already exists
-                    pass
                 except Exception as e:
                     print(f"❌ ERROR executing statement: {e}")
                     print(f"   Statement: {stmt[:100]}...")
                     raise
-        
-        conn.commit()
-        return creates, grants, inserts
+        return executed
     
-    def execute_sql(self, sql_content: str, description: str, dry_run: bool = True) -> int:
-        """Execute SQL content via psycopg3"""
+    def _count_statements(self, statements: List[str]) -> Tuple[int, int, int]:
+        """Count CREATE, GRANT and INSERT statements"""
+        # One sweep by leading verb (the splitter already dropped comments)
+        verbs = Counter(match.group(1).upper() for match in map(VERB_RE.match, statements) if match)
+        return verbs['CREATE'], verbs['GRANT'], verbs['INSERT']
+    
+    def execute_sql(self, sql_content: str, description: str, dry_run: bool = True, conn=None,
+                    single_shot: bool = False) -> int:
+        """Execute SQL content via psycopg3 (on conn if given, else on a new connection)"""
         
-        # If content has dollar quotes, execute as single statement
-        if '$$' in sql_content:
+        if dry_run:
+            # Preview without splitting the whole section: tokenize only the first
+            # statements and bound the total by the terminators (';' in strings
+            # and dollar-quoted bodies included)
+            preview = list(itertools.islice(self.iter_statements(sql_content), 3))
+            if not preview:
+                print(f"⚠️  No SQL statements found in: {description}")
+                return 0
+            
+            print(f"\n🔍 DRY RUN - Would execute: {description}")
+            print(f"   Up to {max(sql_content.count(';'), len(preview))} SQL statements to execute")
+            for i, stmt in enumerate(preview, 1):
+                stmt = ' '.join(stmt.split())
+                print(f"   {i}. {stmt[:100] + '...' if len(stmt) > 100 else stmt}")
+            return 0
+        
+        # Content with dollar quotes, or flagged single-shot, executes as one string
+        single_shot = single_shot or '$$' in sql_content
+        if single_shot:
             statements = [sql_content.strip()]
         else:
             statements = self.split_sql_statements(sql_content)
@@ -286,41 +380,14 @@ class BaisSchemaManagerPsycopg:
             print(f"⚠️  No SQL statements found in: {description}")
             return 0
         
-        if dry_run:
-            print(f"\n🔍 DRY RUN - Would execute: {description}")
-            print(f"   {len(statements)} SQL statements to execute")
-            return 0
-        
         print(f"\n🚀 Executing: {description}")
         
         try:
-            params = self.get_connection_params()
-            with psycopg.connect(**params) as conn:
-                # Special handling for sections with dollar quotes
-                if '$$' in sql_content:
-                    with conn.cursor() as cur:
-                        try:
-                            cur.execute(sql_content)
-                            conn.commit()
-                            print(f"   ✓ Section executed successfully")
-                            return 0
-                        except Exception as e:
-                            print(f"❌ ERROR executing section: {e}")
-                            return 1
-                else:
-                    creates, grants, inserts = self.execute_statements(
-                        conn, statements, description, dry_run=False
-                    )
-                    
-                    # Report results
-                    if creates > 0:
-                        print(f"   ✓ {creates} objects created")
-                    if grants > 0:
-                        print(f"   ✓ {grants} permissions granted")
-                    if inserts > 0:
-                        print(f"   ✓ {inserts} data rows inserted")
-                    
-                    return 0
+            if conn is not None:
+                return self.execute_sql_on(conn, sql_content, statements, description, single_shot)
+            
+            with self.connect() as conn:
+                return self.execute_sql_on(conn, sql_content, statements, description, single_shot)
                 
         except psycopg.OperationalError as e:
             print(f"❌ ERROR: Could not connect to database: {e}")
@@ -329,20 +396,58 @@ class BaisSchemaManagerPsycopg:
             print(f"❌ ERROR: {e}")
             return 1
     
-    def run_section(self, section_name: str, dry_run: bool = True) -> int:
+    def execute_sql_on(self, conn, sql_content: str, statements: List[str], description: str,
+                       single_shot: bool = False) -> int:
+        """Execute a section's statements on an open connection, committing on success"""
+        if single_shot:
+            # Text cursor: a multi-statement string needs the simple query protocol
+            with conn.cursor() as cur:
+                try:
+                    cur.execute(sql_content)
+                    conn.commit()
+                except Exception as e:
+                    # Leave the connection usable for the sections after this one
+                    conn.rollback()
+                    print(f"❌ ERROR executing section: {e}")
+                    return 1
+            
+            # The server split the string; count statement verbs in the source
+            verbs = Counter(verb.upper() for verb in VERB_RE.findall(sql_content))
+            creates, grants, inserts = verbs['CREATE'], verbs['GRANT'], verbs['INSERT']
+        else:
+            creates, grants, inserts = self.execute_statements(
+                conn, statements, description, dry_run=False
+            )
+        
+        # Report results in one print so concurrent sections don't interleave
+        report = [f"   ✓ {description} done"]
+        if creates > 0:
+            report.append(f"   ✓ {creates} objects created")
+        if grants > 0:
+            report.append(f"   ✓ {grants} permissions granted")
+        if inserts > 0:
+            report.append(f"   ✓ {inserts} data rows inserted")
+        print('\n'.join(report))
+        
+        return 0
+    
+    def run_section(self, section_name: str, dry_run: bool = True, conn=None) -> int:
         """Run a specific section"""
         if section_name not in self.sections:
             print(f"❌ ERROR: Section '{section_name}' not found")
             self.list_sections()
             return 1
         
-        sql_content = self.sections[section_name]
+        sql_content = self.get_section(section_name)
         
         # Add search path reset for schema sections
         if section_name.startswith('SCHEMA:'):
             sql_content = "SET search_path TO public;\n" + sql_content
         
-        return self.execute_sql(sql_content, f"Section {section_name}", dry_run)
+        return self.execute_sql(
+            sql_content, f"Section {section_name}", dry_run, conn=conn,
+            single_shot=section_name in SINGLE_SHOT_SECTIONS
+        )
     
     def run_all(self, dry_run: bool = True) -> int:
         """Run all sections in order"""
@@ -367,17 +472,46 @@ class BaisSchemaManagerPsycopg:
         
         print(f"\n🚀 Running all {len(section_order)} sections...")
         
+        # Consecutive SCHEMA: sections build disjoint namespaces, so they form
+        # one stage that runs concurrently; every other section is its own stage
+        stages = []
         for i, section in enumerate(section_order, 1):
-            print(f"\n[{i}/{len(section_order)}] Processing {section}...")
-            
             if section not in self.sections:
                 print(f"⚠️  WARNING: Section '{section}' not found, skipping")
                 continue
-            
-            result = self.run_section(section, dry_run=False)
-            if result != 0:
-                print(f"❌ Failed at section {section}")
-                return result
+            if section.startswith('SCHEMA:') and stages and stages[-1][0][1].startswith('SCHEMA:'):
+                stages[-1].append((i, section))
+            else:
+                stages.append([(i, section)])
+        
+        try:
+            # One connection for the serial sections; each section still commits on its own
+            with self.connect() as conn:
+                for stage in stages:
+                    for i, section in stage:
+                        print(f"\n[{i}/{len(section_order)}] Processing {section}...")
+                    
+                    names = [section for _, section in stage]
+                    if len(names) == 1:
+                        results = [self.run_section(names[0], dry_run=False, conn=conn)]
+                    else:
+                        # Each schema opens its own connection (psycopg connections
+                        # must not be shared between threads)
+                        with ThreadPoolExecutor(max_workers=len(names)) as pool:
+                            results = list(pool.map(
+                                lambda section: self.run_section(section, dry_run=False), names
+                            ))
+                    
+                    for section, result in zip(names, results):
+                        if result != 0:
+                            print(f"❌ Failed at section {section}")
+                            return result
+        except psycopg.OperationalError as e:
+            print(f"❌ ERROR: Could not connect to database: {e}")
+            return 1
+        except RuntimeError as e:
+            print(f"❌ ERROR: {e}")
+            return 1
         
         print("\n✅ All sections completed successfully!")
         return 0
@@ -427,9 +561,8 @@ class BaisSchemaManagerPsycopg:
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
-            params = self.get_connection_params()
-            with psycopg.connect(**params) as conn:
-                with conn.cursor() as cur:
+            with self.connect() as conn:
+                with conn.cursor(binary=True) as cur:
                     cur.execute("SELECT current_user, current_database()")
                     user, database = cur.fetchone()
                     print(f"✅ Connected as {user} to {database}")
@@ -29,16 +29,22 @@ from dotenv import load_dotenv
 from pathlib import Path
 import re
 
-def extract_sql_section(sql_content, section_name):
-    """Extract a specific section from the SQL file based on section markers"""
-    # Pattern to match section content between markers
-    pattern = rf'-- ==================== SECTION: {re.escape(section_name)} ====================\n(.*?)\n-- ==================== END SECTION: {re.escape(section_name)} ===================='
-    
-    match = re.search(pattern, sql_content, re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    else:
-        raise ValueError(f"Section '{section_name}' not found in SQL file")
+# Matches every SECTION block; group(1) is the name, group(2) the body
+SECTION_RE = re.compile(
+    r'-- ={20} SECTION: (\S+) ={20}\n(.*?)\n-- ={20} END SECTION: \1 ={20}',
+    re.DOTALL
+)
+
+def index_sql_sections(sql_content):
+    """Map every section name in the SQL file to its stripped body in one pass"""
+    return {m.group(1): m.group(2).strip() for m in SECTION_RE.finditer(sql_content)}
+
+def extract_sql_section(sections, section_name):
+    """Look up a section from the index built by index_sql_sections"""
+    try:
+        return sections[section_name]
+    except KeyError:
+        raise ValueError(f"Section '{section_name}' not found in SQL file") from None
 
 def validate_schemas(requested_schemas, allowed_schemas):
     """Validate requested schemas against allowed list from .env"""
@@ -115,7 +121,7 @@ def main():
         sys.exit(1)
     
     with open(sql_file_path, 'r') as f:
-        sql_content = f.read()
+        sql_sections = index_sql_sections(f.read())
     
     print(f"\n📋 Configuration:")
     print(f"   🖥️  Host: {pg_host}:{pg_port}")
@@ -212,7 +218,7 @@ def main():
                 
                 # Extract and execute the schema section
                 try:
-                    schema_sql = extract_sql_section(sql_content, f'SCHEMA:{schema}')
+                    schema_sql = extract_sql_section(sql_sections, f'SCHEMA:{schema}')
                     cur.execute(schema_sql)
                     
                     print(f"✅ Schema {schema} recreated with:")
@@ -241,7 +247,7 @@ def main():
             else:
                 print("⚡ Refreshing all user permissions...")
                 try:
-                    permissions_sql = extract_sql_section(sql_content, 'PERMISSIONS')
+                    permissions_sql = extract_sql_section(sql_sections, 'PERMISSIONS')
                     cur.execute(permissions_sql)
                     print("✅ Permissions refreshed to original specifications")
                 except ValueError as e: